@@ -23,6 +23,8 @@ class ProxyState:
     upload_bytes: int = 0
     download_bytes: int = 0
     vpn_auto_connected: bool = False
+    # Digest of the config xray-core is currently running with
+    last_config_hash: bytes = b""
 
     # Listeners
     _state_listeners: list[Callable[[ProxyState], None]] = field(default_factory=list)
@@ -57,6 +59,7 @@ class ProxyState:
         self.started_profile_id = -1
         self.upload_bytes = 0
         self.download_bytes = 0
+        self.last_config_hash = b""
         self.notify_listeners()
 
 
@@ -3,12 +3,10 @@ from __future__ import annotations
 import json
 import logging
 import subprocess
-import tempfile
 import time
 import requests
 from collections.abc import Callable
 from dataclasses import dataclass
-from pathlib import Path
 from typing import IO, Any
 
 from src.core.config import (
@@ -18,9 +16,21 @@ from src.core.config import (
     find_xray_binary,
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("tenga.xray_manager")
 
 
+def dump_config(config: dict[str, Any]) -> bytes:
+    """Serialize xray-core configuration to indented UTF-8 JSON (orjson if installed)."""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 @dataclass
 class TrafficStats:
     """Traffic statistics."""
@@ -66,7 +76,6 @@ class XrayManager:
         self._stats_api_addr = stats_api_addr
         self._stats_api_token = stats_api_token
         self._process: subprocess.Popen | None = None
-        self._config_file: Path | None = None
         self._on_stop_callback: Callable[[], None] | None = None
         self._log_file: IO[bytes] | None = None
 
@@ -184,32 +193,38 @@ class XrayManager:
 
         return config
 
-    def start(self, config: dict[str, Any]) -> tuple[bool, str]:
+    def serialize_config(self, config: dict[str, Any]) -> bytes:
         """
-        Start xray-core with configuration.
+        Serialize configuration exactly as start() passes it to xray-core.
 
         Args:
             config: xray-core configuration (dict)
 
+        Returns:
+            Serialized configuration with stats and api sections
+        """
+        return dump_config(self._inject_stats_api(config))
+
+    def start(self, config: dict[str, Any] | bytes) -> tuple[bool, str]:
+        """
+        Start xray-core with configuration.
+
+        Args:
+            config: xray-core configuration (dict), or bytes from serialize_config()
+
         Returns:
             (success, error_message)
         """
         if self.is_running:
             self.stop()
 
-        config = self._inject_stats_api(config)
-
-        try:
-            with tempfile.NamedTemporaryFile(
-                mode="w",
-                suffix=".json",
-                delete=False,
-                encoding="utf-8",
-            ) as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-                self._config_file = Path(f.name)
-        except Exception as e:
-            return False, f"Error writing configuration: {e}"
+        if isinstance(config, bytes):
+            serialized = config
+        else:
+            try:
+                serialized = self.serialize_config(config)
+            except Exception as e:
+                return False, f"Error serializing configuration: {e}"
 
         # Start process
         log_file_opened = False
@@ -222,20 +237,30 @@ class XrayManager:
             self._log_file = None
 
         try:
+            # Configuration is passed on stdin, no temporary file is written
             if self._log_file is not None:
                 # Redirect both stdout and stderr to the log file
                 self._process = subprocess.Popen(
-                    [self._binary_path, "-config", str(self._config_file)],
+                    [self._binary_path, "-config", "stdin:"],
+                    stdin=subprocess.PIPE,
                     stdout=self._log_file,
                     stderr=subprocess.STDOUT,
                 )
             else:
                 self._process = subprocess.Popen(
-                    [self._binary_path, "-config", str(self._config_file)],
+                    [self._binary_path, "-config", "stdin:"],
+                    stdin=subprocess.PIPE,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                 )
 
+            try:
+                self._process.stdin.write(serialized)
+                self._process.stdin.close()
+            except BrokenPipeError:
+                # xray-core exited early, reported below
+                pass
+
             time.sleep(0.5)
 
             if self._process.poll() is not None:
@@ -267,12 +292,12 @@ class XrayManager:
             self._cleanup()
             return False, f"Startup error: {e}"
 
-    def reload_config(self, config: dict[str, Any]) -> tuple[bool, str]:
+    def reload_config(self, config: dict[str, Any] | bytes) -> tuple[bool, str]:
         """
         Reload xray-core configuration without stopping the process.
 
         Args:
-            config: New xray-core configuration
+            config: New xray-core configuration (dict), or bytes from serialize_config()
 
         Returns:
             (success, error_message)
@@ -330,13 +355,6 @@ class XrayManager:
                 pass
             self._log_file = None
 
-        if self._config_file and self._config_file.exists():
-            try:
-                self._config_file.unlink()
-            except Exception:
-                pass
-            self._config_file = None
-
     def get_version(self) -> dict[str, Any] | None:
         """Get xray-core version."""
         if not self.is_running:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import re
 from abc import ABC
 from dataclasses import dataclass, field, fields
 from pathlib import Path
@@ -285,6 +286,24 @@ class RoutingMode:
 
 ROUTING_GROUPS = ["direct", "vpn", "proxy"]
 DEFAULT_ROUTING_ORDER = ["direct", "vpn", "proxy"]
+# Networks added to the direct list when bypass_local_networks is enabled
+LOCAL_NETWORK_CIDRS = (
+    "127.0.0.0/8",
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+    "169.254.0.0/16",
+    "::1/128",
+    "fc00::/7",
+    "fe80::/10",
+)
+
+# Routing list entry classification
+_CIDR_RE = re.compile(r"[^/]*/[0-9]+")
+_IPV4_ADDR_RE = re.compile(r"[0-9][0-9.]*")
+
+# Parsed routing list files: path -> (mtime_ns, size, entries)
+_list_file_cache: dict[Path, tuple[int, int, tuple[str, ...]]] = {}
 
 
 @dataclass
@@ -300,20 +319,31 @@ class RoutingSettings(ConfigBase):
     rule_order: list[str] = field(default_factory=lambda: DEFAULT_ROUTING_ORDER.copy())
 
     def load_list_file(self, filepath: Path) -> list[str]:
-        """Load list from file."""
-        result = []
-        if not filepath.exists():
-            return result
+        """Load list from file.
 
+        Parsed entries are cached per path and reused while the file's
+        modification time and size are unchanged.
+        """
+        try:
+            stat = filepath.stat()
+        except OSError:
+            return []
+
+        cached = _list_file_cache.get(filepath)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return list(cached[2])
+
+        result = []
         try:
-            content = filepath.read_text(encoding="utf-8")
+            content = filepath.read_bytes().decode("utf-8")
             for line in content.split("\n"):
                 line = line.strip()
                 if line and not line.startswith("#"):
                     result.append(line)
         except Exception:
-            pass
+            return result
 
+        _list_file_cache[filepath] = (stat.st_mtime_ns, stat.st_size, tuple(result))
         return result
 
     def load_lists_from_files(self, config_dir: Path) -> None:
@@ -347,39 +377,30 @@ class RoutingSettings(ConfigBase):
         """
         Split entries into domains and IP/CIDR.
 
+        Entries may contain several comma-separated values. Bare IPv4
+        addresses get a /32 suffix, duplicates are dropped (first occurrence
+        order is kept).
+
         Returns:
             (domains, ips)
         """
-        domains = []
-        ips = []
+        domains: dict[str, None] = {}
+        ips: dict[str, None] = {}
 
         for entry in entries:
-            entry = entry.strip().rstrip(",").strip()
-            if not entry:
-                continue
-
-            if "," in entry:
-                for part in entry.split(","):
-                    part = part.strip().rstrip(",").strip()
-                    if not part:
-                        continue
-                    part_domains, part_ips = self.parse_entries([part])
-                    domains.extend(part_domains)
-                    ips.extend(part_ips)
-                continue
-
-            if "/" in entry:
-                parts = entry.split("/")
-                if len(parts) == 2 and parts[1].isdigit():
-                    ips.append(entry)
+            for part in entry.split(","):
+                part = part.strip()
+                if not part:
                     continue
 
-            if entry[0].isdigit() and all(c.isdigit() or c == "." for c in entry):
-                ips.append(entry + "/32")
-                continue
-            domains.append(entry)
+                if _CIDR_RE.fullmatch(part):
+                    ips[part] = None
+                elif _IPV4_ADDR_RE.fullmatch(part):
+                    ips[part + "/32"] = None
+                else:
+                    domains[part] = None
 
-        return domains, ips
+        return list(domains), list(ips)
 
     def get_rule_order(self) -> list[str]:
         """
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 import logging
 import subprocess
+import time
+from collections.abc import Callable
 
 logger = logging.getLogger("tenga.sys.vpn")
 
+# Seconds a connection or interface listing is reused before querying again
+_LIST_CACHE_TTL = 5.0
+_list_cache: dict[str, tuple[float, list[str]]] = {}
+
 
 def list_vpn_connections() -> list[str]:
     """
@@ -376,6 +382,53 @@ def list_network_interfaces() -> list[str]:
         return []
 
 
+def _cached_list(
+    key: str, query: Callable[[], list[str]], ttl: float | None = _LIST_CACHE_TTL
+) -> list[str]:
+    """Get listing from cache, querying it again once it is older than ttl (None: never)."""
+    now = time.monotonic()
+    entry = _list_cache.get(key)
+    if entry is None or (ttl is not None and now - entry[0] >= ttl):
+        entry = _list_cache[key] = (now, query())
+    return list(entry[1])
+
+
+def cached_vpn_connections() -> list[str]:
+    """
+    Get list of VPN connections, reusing a listing made within the last few seconds.
+
+    Returns:
+        List of connection names
+    """
+    return _cached_list("vpn_connections", list_vpn_connections)
+
+
+def cached_network_interfaces() -> list[str]:
+    """
+    Get list of network interfaces, listed once until invalidate_list_cache().
+
+    Interfaces are rarely hot-plugged, so one listing serves the whole
+    session; an interface added later shows up only after an explicit refresh.
+
+    Returns:
+        List of interface names
+    """
+    return _cached_list("network_interfaces", list_network_interfaces, ttl=None)
+
+
+def invalidate_list_cache(key: str | None = None) -> None:
+    """
+    Drop cached listings.
+
+    Args:
+        key: Listing to drop ("vpn_connections" or "network_interfaces"), None drops all
+    """
+    if key is None:
+        _list_cache.clear()
+    else:
+        _list_cache.pop(key, None)
+
+
 def get_default_interface(vpn_interface: str | None = None) -> str | None:
     """
     Get default network interface.
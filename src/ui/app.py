@@ -1,22 +1,27 @@
 from __future__ import annotations
 
-import json
+import hashlib
 import logging
+import os
+import re
 import signal
+import threading
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 
 import gi
 from src.db.config import RoutingMode
 
 gi.require_version("Gtk", "3.0")
 
-from gi.repository import Gtk
+from gi.repository import GLib, Gtk
 
 from src.core.config import GUI_LOG_FILE
 from src.core.context import AppContext, get_context, init_context
 from src.core.logging_utils import setup_logging as setup_core_logging
 from src.core.monitor import ConnectionMonitor, ConnectionStatus
-from src.db.config import RoutingMode
+from src.db.config import LOCAL_NETWORK_CIDRS, RoutingMode, RoutingSettings
 from src.db.profiles import ProfileEntry
 from src.sys.proxy import clear_system_proxy, set_system_proxy
 from src.sys.vpn import (
@@ -27,7 +32,6 @@ from src.sys.vpn import (
     get_vpn_interface,
     is_vpn_active,
 )
-from src.ui.dialogs import show_add_profile_dialog, show_settings_dialog
 from src.ui.main_window import MainWindow
 from src.ui.tray import TrayIcon
 
@@ -36,12 +40,139 @@ from src.db.config import DEFAULT_ROUTING_ORDER
 logger = logging.getLogger("tenga.ui.app")
 
 
+def _build_local_dns(dns_url: str, detour: str) -> dict:
+    """Main DNS server: system resolver."""
+    return {
+        "tag": "main-dns",
+        "type": "local",
+        "detour": detour,
+    }
+
+
+def _build_doh_dns(dns_url: str, detour: str) -> dict:
+    """Main DNS server: DNS over HTTPS."""
+    parsed = urlparse(dns_url)
+    server_host = parsed.netloc.split(":")[0] if ":" in parsed.netloc else parsed.netloc
+    server_port = parsed.port if parsed.port else 443
+    path = parsed.path if parsed.path else "/dns-query"
+
+    return {
+        "tag": "main-dns",
+        "type": "https",
+        "server": server_host,
+        "server_port": server_port,
+        "path": path,
+        "detour": detour,
+    }
+
+
+def _build_dot_dns(dns_url: str, detour: str) -> dict:
+    """Main DNS server: DNS over TLS."""
+    address = dns_url.replace("tls://", "")
+    server = address.split(":")[0]
+    port = 853
+    if ":" in address:
+        port = int(dns_url.split(":")[-1])
+
+    return {
+        "tag": "main-dns",
+        "type": "tls",
+        "server": server,
+        "server_port": port,
+        "detour": detour,
+    }
+
+
+def _build_udp_dns(dns_url: str, detour: str) -> dict:
+    """Main DNS server: plain IP or domain over UDP."""
+    server = dns_url.replace("udp://", "").replace("tcp://", "")
+    return {
+        "tag": "main-dns",
+        "type": "udp",
+        "server": server,
+        "detour": detour,
+    }
+
+
+# Status shown in main window while connecting (key: last finished step)
+_CONNECT_STEP_LABELS = {
+    "start": "Подключение...",
+    "vpn": "VPN подключен, запуск xray-core...",
+    "vpn_failed": "VPN не подключен, запуск xray-core...",
+    "config": "Запуск xray-core...",
+    "xray": "Настройка системного прокси...",
+}
+
+# IPv4 address (with optional port) anywhere in a NetworkManager DNS entry
+_VPN_DNS_RE = re.compile(r"(\d{1,3}(?:\.\d{1,3}){3})\]?(?::(\d+))?")
+
+# Server addresses starting with an ASCII digit are treated as IP literals
+_DIGITS = frozenset("0123456789")
+
+# Max number of distinct routing list sets kept parsed
+_ROUTE_CACHE_SIZE = 16
+
+# Delay before showing a tray notification; newer ones replace pending ones
+_NOTIFICATION_DELAY_MS = 200
+# Seconds quit() waits for a cancelled connect (nmcli "connection up" times out after 30)
+_QUIT_WAIT_TIMEOUT = 35
+# Interval of quit()'s check whether the cancelled connect has finished
+_QUIT_POLL_MS = 100
+
+# DNS URL scheme -> main DNS server builder
+_DNS_BUILDERS = {
+    "local": _build_local_dns,
+    "https": _build_doh_dns,
+    "tls": _build_dot_dns,
+    "udp": _build_udp_dns,
+    "tcp": _build_udp_dns,
+}
+
+
 def setup_logging(context: AppContext) -> None:
     """Initialize logging for GUI."""
     setup_core_logging(GUI_LOG_FILE, level=logging.INFO)
     logger.info("GUI logging initialized, file: %s", GUI_LOG_FILE)
 
 
+def _config_digest(serialized: bytes) -> bytes:
+    """Digest of serialized xray-core configuration."""
+    return hashlib.blake2b(serialized, digest_size=16).digest()
+
+
+def _field_rules(ips: list[str], domains: list[str], outbound_tag: str) -> list[dict]:
+    """Build xray-core field rules (IPs first, then domains) for one routing group."""
+    rules = []
+    if ips:
+        rules.append({"type": "field", "ip": ips, "outboundTag": outbound_tag})
+    if domains:
+        rules.append({"type": "field", "domain": domains, "outboundTag": outbound_tag})
+    return rules
+
+
+def _format_dns_rules(dns_rules: list[dict]) -> str:
+    """Format DNS rules for debug logging."""
+    return "\n".join(f"    - {rule}" for rule in dns_rules)
+
+
+def _show_error_dialog(title: str, message: str) -> None:
+    """Show modal error dialog (startup errors only, Gdk is imported lazily)."""
+    from gi.repository import Gdk
+
+    dialog = Gtk.MessageDialog(
+        flags=0,
+        message_type=Gtk.MessageType.ERROR,
+        buttons=Gtk.ButtonsType.OK,
+        text=title,
+    )
+    dialog.set_wmclass("tenga-proxy", "tenga-proxy")
+    dialog.set_type_hint(Gdk.WindowTypeHint.DIALOG)
+    dialog.set_skip_taskbar_hint(True)
+    dialog.format_secondary_text(message)
+    dialog.run()
+    dialog.destroy()
+
+
 class TengaApp:
     """Main Tenga application."""
 
@@ -54,6 +185,26 @@ class TengaApp:
 
         # Last selected profile
         self._last_profile_id: int | None = None
+        # Held by the connect worker thread
+        self._connect_lock = threading.Lock()
+        # Serializes xray-core start/stop/reload and system proxy changes
+        # between the connect worker and the main loop
+        self._runtime_lock = threading.RLock()
+        # Cancel event of the latest connect attempt, set by _disconnect to make it
+        # give up; also identifies the attempt whose callbacks may still apply
+        self._connect_cancel = threading.Event()
+        # VPN connection brought up for the current profile, guarded by _runtime_lock
+        self._auto_connected_vpn: str | None = None
+        self._connect_thread: threading.Thread | None = None
+        # Set once quit() has started, see _poll_quit
+        self._quit_deadline: float | None = None
+        # Digest of the last written current_config.json
+        self._last_config_digest: bytes = b""
+        # Parsed routing lists, see _parse_routing_lists
+        self._route_cache: dict[tuple, tuple] = {}
+        # Coalesced tray notification, see _queue_notification
+        self._pending_notification: tuple[str, str] | None = None
+        self._notification_source: int | None = None
 
         # Connection monitor
         self._monitor: ConnectionMonitor | None = None
@@ -74,8 +225,6 @@ class TengaApp:
     ) -> None:
         """Handle monitoring status changes."""
         if self._window:
-            from gi.repository import GLib
-
             GLib.idle_add(
                 self._window.update_monitoring_status,
                 current.proxy_ok,
@@ -86,16 +235,30 @@ class TengaApp:
             )
 
     def _setup_signal_handlers(self) -> None:
-        """Setup signal handlers."""
-        signal.signal(signal.SIGINT, self._on_signal)
-        signal.signal(signal.SIGTERM, self._on_signal)
+        """
+        Setup signal handlers.
+
+        Shutdown always runs on the GTK main loop, never inside a signal
+        handler. SIGTERM is dispatched by GLib. SIGINT needs a Python-level
+        handler: while it is default_int_handler, PyGObject's Gtk.main
+        replaces GLib's handler with one raising KeyboardInterrupt.
+        """
+        GLib.unix_signal_add(GLib.PRIORITY_HIGH, signal.SIGTERM, self._on_signal, signal.SIGTERM)
+        signal.signal(signal.SIGINT, self._on_sigint)
+
+    def _on_sigint(self, signum: int, frame) -> None:
+        """Python SIGINT handler, defers shutdown to the GTK main loop."""
+        GLib.idle_add(self._on_signal, signum, priority=GLib.PRIORITY_HIGH)
 
-    def _on_signal(self, signum: int, frame) -> None:
-        """Signal handler."""
+    def _on_signal(self, signum: int) -> bool:
+        """Handle SIGINT/SIGTERM on the GTK main loop."""
         logger.info("Received signal %s, terminating application", signum)
         if self._lock:
-            self._lock.release()
+            # Another signal may still arrive while quitting
+            lock, self._lock = self._lock, None
+            lock.release()
         self.quit()
+        return False
 
     def run(self) -> int:
         """Run application."""
@@ -111,22 +274,7 @@ class TengaApp:
                     "3. Run ./install.sh for automatic installation"
                 )
 
-                # Show error dialog
-                dialog = Gtk.MessageDialog(
-                    flags=0,
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text="xray-core не найден",
-                )
-                dialog.set_wmclass("tenga-proxy", "tenga-proxy")
-                from gi.repository import Gdk
-
-                dialog.set_type_hint(Gdk.WindowTypeHint.DIALOG)
-                dialog.set_skip_taskbar_hint(True)
-                dialog.format_secondary_text(error_msg)
-                dialog.run()
-                dialog.destroy()
-
+                _show_error_dialog("xray-core не найден", error_msg)
                 logger.error("xray-core not found")
                 return 1
 
@@ -162,16 +310,40 @@ class TengaApp:
 
     def quit(self) -> None:
         """Quit application."""
-        # Disconnect proxy
-        if self._context.proxy_state.is_running:
+        if self._quit_deadline is not None:
+            return
+        self._quit_deadline = time.monotonic() + _QUIT_WAIT_TIMEOUT
+        # Disconnect proxy, also when a connect is still in flight
+        if (
+            self._context.proxy_state.is_running
+            or self._connect_lock.locked()
+            or self._context.xray_manager.is_running
+        ):
             self._disconnect()
+        # A cancelled worker still undoes its VPN auto-connect; let it finish
+        # without blocking the main loop
+        if self._connect_thread is not None and self._connect_thread.is_alive():
+            if self._window:
+                self._window.hide()
+            GLib.timeout_add(_QUIT_POLL_MS, self._poll_quit)
+            return
+        self._finish_quit()
+
+    def _poll_quit(self) -> bool:
+        """Finish quitting once the cancelled connect worker is done (runs in GTK main loop)."""
+        if self._connect_thread.is_alive() and time.monotonic() < self._quit_deadline:
+            return True
+        self._finish_quit()
+        return False
+
+    def _finish_quit(self) -> None:
+        """Save state, release resources and leave the GTK main loop."""
         # Save configuration
         self._context.save_all()
         # Cleanup resources
+        self._flush_notification()
         if self._tray:
             self._tray.cleanup()
-        if self._window:
-            pass
         # Quit GTK
         Gtk.main_quit()
 
@@ -188,7 +360,7 @@ class TengaApp:
         if profile_id is not None:
             self._connect(profile_id)
         else:
-            self._tray.show_notification("Tenga", "No available profiles")
+            self._notify("Tenga", "No available profiles")
 
     def _on_connect(self, profile_id: int) -> None:
         """Connect to profile."""
@@ -204,6 +376,8 @@ class TengaApp:
 
     def _on_add_profile(self) -> None:
         """Add profile via dialog."""
+        from src.ui.dialogs import show_add_profile_dialog
+
         profile = show_add_profile_dialog(self._window)
 
         if profile:
@@ -215,9 +389,7 @@ class TengaApp:
             if self._window:
                 self._window.refresh()
 
-            self._tray.show_notification(
-                "Profile added", f"{entry.name}\n{profile.display_address}"
-            )
+            self._notify("Profile added", f"{entry.name}\n{profile.display_address}")
 
     def _on_show_window(self) -> None:
         """Show main window."""
@@ -227,85 +399,201 @@ class TengaApp:
 
     def _on_settings(self) -> None:
         """Open settings."""
+        from src.ui.dialogs import show_settings_dialog
+
         show_settings_dialog(self._context, self._window, on_config_reload=self._reload_config)
 
     def _connect(self, profile_id: int) -> bool:
-        """Connect to profile."""
-        # If connected - disconnect
-        if self._context.proxy_state.is_running:
-            self._disconnect()
+        """
+        Connect to profile.
+
+        VPN activation, xray-core start and system proxy setup may block for
+        seconds, so they run in a worker thread; progress is posted back to
+        the GTK main loop via GLib.idle_add.
+
+        Returns:
+            True if connection was started, False if another one is in progress
+        """
+        if not self._connect_lock.acquire(blocking=False):
+            logger.warning("Connection already in progress, ignoring profile %s", profile_id)
+            return False
+        cancel = self._connect_cancel = threading.Event()
+
+        if self._window:
+            self._window.set_connect_progress(_CONNECT_STEP_LABELS["start"])
 
+        self._connect_thread = threading.Thread(
+            target=self._connect_worker, args=(profile_id, cancel), daemon=True
+        )
+        self._connect_thread.start()
+        return True
+
+    def _connect_worker(self, profile_id: int, cancel: threading.Event) -> None:
+        """Connect to profile in background thread (one at a time)."""
+        try:
+            self._connect_sync(profile_id, cancel)
+        except Exception as e:
+            logger.exception("Unhandled error while connecting profile %s: %s", profile_id, e)
+            self._post(cancel, self._on_connect_step, "xray", False, str(e))
+        finally:
+            self._connect_lock.release()
+
+    def _post(self, cancel: threading.Event, callback, *args) -> None:
+        """Queue a connect worker callback on the GTK main loop."""
+        GLib.idle_add(self._run_if_current, cancel, callback, *args)
+
+    def _run_if_current(self, cancel: threading.Event, callback, *args) -> bool:
+        """
+        Run a connect worker callback unless its attempt went stale (runs in GTK main loop).
+
+        The worker releases _connect_lock before its callbacks run, so a
+        disconnect and a new connect may come in between; results of the
+        cancelled attempt must not touch proxy state or UI then.
+        """
+        if cancel is self._connect_cancel and not cancel.is_set():
+            callback(*args)
+        return False
+
+    def _connect_sync(self, profile_id: int, cancel: threading.Event) -> bool:
+        """
+        Connect to profile (blocking, runs in the connect worker thread).
+
+        xray-core and system proxy are changed under _runtime_lock, after
+        checking that _disconnect has not cancelled the connect meanwhile;
+        proxy state is updated on the main loop by _on_connected.
+        """
+        proxy_state = self._context.proxy_state
         profile = self._context.profiles.get_profile(profile_id)
+
+        # If connected - disconnect, unless the same config is already running
+        if proxy_state.is_running:
+            if (
+                profile
+                and proxy_state.started_profile_id == profile_id
+                and self._is_running_config(profile)
+            ):
+                logger.info("Profile %s is already running with the same configuration", profile_id)
+                self._post(cancel, self._on_connect_step, "unchanged", True, profile.name)
+                return True
+            with self._runtime_lock:
+                if cancel.is_set():
+                    return False
+                self._stop_runtime()
+            self._post(cancel, self._on_stopped)
+
         if not profile:
             logger.error("Profile %s not found", profile_id)
+            self._post(cancel, self._on_connect_step, "profile", False, "")
             return False
 
-        try:
-            self._context.proxy_state.vpn_auto_connected = False
-        except Exception:
-            pass
-
-        if (
-            profile.vpn_settings
-            and profile.vpn_settings.enabled
-            and getattr(profile.vpn_settings, "auto_connect", False)
-        ):
-            was_active_before = is_vpn_active(profile.vpn_settings.connection_name)
+        vpn_settings = profile.vpn_settings
+        auto_vpn = None
+        if vpn_settings and vpn_settings.enabled and vpn_settings.auto_connect:
+            connection_name = vpn_settings.connection_name
+            was_active_before = is_vpn_active(connection_name)
             if not was_active_before:
                 logger.info(
                     "Auto-connecting VPN '%s' before starting profile %s",
-                    profile.vpn_settings.connection_name,
+                    connection_name,
                     profile_id,
                 )
-                if not connect_vpn(profile.vpn_settings.connection_name):
+                if not connect_vpn(connection_name):
                     logger.warning(
                         "Failed to auto-connect VPN '%s', continuing without VPN",
-                        profile.vpn_settings.connection_name,
+                        connection_name,
                     )
+                    self._post(cancel, self._on_connect_step, "vpn", False, "")
                 else:
-                    try:
-                        self._context.proxy_state.vpn_auto_connected = True
-                    except Exception:
-                        pass
+                    auto_vpn = connection_name
+                    self._post(cancel, self._on_connect_step, "vpn", True, "")
+
+        with self._runtime_lock:
+            # Stopping the runtime disconnects the VPN brought up above too
+            self._auto_connected_vpn = auto_vpn
+            if cancel.is_set():
+                logger.info("Connect to profile %s cancelled", profile_id)
+                self._stop_runtime()
+                return False
 
         self._last_profile_id = profile_id
         config = self._create_config(profile)
         if not config:
+            self._post(cancel, self._on_connect_step, "config", False, "")
             return False
-        # Save configuration for debugging
-        config_path = self._context.config_dir / "current_config.json"
-        config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
-        logger.info("Configured profile id=%s, file: %s", profile_id, config_path)
+        # Serialized once: digest, debug copy and xray-core stdin share the bytes
+        serialized = self._context.xray_manager.serialize_config(config)
+        config_hash = self._save_current_config(serialized)
+        logger.info("Configured profile id=%s", profile_id)
+        self._post(cancel, self._on_connect_step, "config", True, "")
         # Start xray-core
-        try:
-            success, error = self._context.xray_manager.start(config)
+        with self._runtime_lock:
+            if cancel.is_set():
+                logger.info("Connect to profile %s cancelled", profile_id)
+                self._stop_runtime()
+                return False
+            try:
+                success, error = self._context.xray_manager.start(serialized)
+            except Exception as e:
+                logger.exception("Error starting xray-core: %s", e)
+                success, error = False, str(e)
             if not success:
                 logger.error("Error starting xray-core: %s", error)
-                if self._tray:
-                    self._tray.show_notification("Error", f"Failed to start: {error}")
+                self._post(cancel, self._on_connect_step, "xray", False, error)
                 return False
-            # Set state as running
-            self._context.proxy_state.set_running(profile_id)
+            self._post(cancel, self._on_connect_step, "xray", True, "")
 
             # Configure system proxy
             port = self._context.config.inbound_socks_port
-            set_system_proxy(http_port=port, socks_port=port)
+            proxy_ok = set_system_proxy(http_port=port, socks_port=port)
+
+        self._post(cancel, self._on_connected, profile_id, config_hash, proxy_ok, profile.name)
+        return True
+
+    def _on_connected(
+        self, profile_id: int, config_hash: bytes, proxy_ok: bool, profile_name: str
+    ) -> bool:
+        """Mark proxy as running once the worker started it (runs in GTK main loop)."""
+        proxy_state = self._context.proxy_state
+        proxy_state.vpn_auto_connected = self._auto_connected_vpn is not None
+        proxy_state.last_config_hash = config_hash
+        proxy_state.set_running(profile_id)
+        if self._monitor:
+            self._monitor.start()
+        self._on_connect_step("proxy", proxy_ok, profile_name)
+        return False
 
-            profile = self._context.profiles.get_profile(profile_id)
-            name = profile.name if profile else "Unknown"
-            if self._tray:
-                self._tray.show_notification("Connected", f"Profile: {name}")
+    def _is_running_config(self, profile: ProfileEntry) -> bool:
+        """Check whether profile config matches the one xray-core is running."""
+        config = self._create_config(profile)
+        if not config:
+            return False
+        config_hash = _config_digest(self._context.xray_manager.serialize_config(config))
+        return config_hash == self._context.proxy_state.last_config_hash
 
-            if self._monitor:
-                self._monitor.start()
+    def _on_connect_step(self, step: str, ok: bool, message: str) -> bool:
+        """Report connect progress (runs in GTK main loop)."""
+        logger.debug("Connect step %s finished: %s", step, "ok" if ok else "failed")
 
-            return True
+        if step == "unchanged":
+            # Nothing was (re)started, just drop the progress label
+            if self._window:
+                self._window.set_connect_progress(None)
+        elif step == "proxy":
+            # Last step: xray-core is running, UI follows proxy state
+            if self._window:
+                self._window.set_connect_progress(None)
+            self._notify("Connected", f"Profile: {message}")
+        elif not ok and step != "vpn":
+            if self._window:
+                self._window.set_connect_progress(None)
+            if message:
+                self._notify("Error", f"Failed to start: {message}")
+        elif self._window:
+            label = _CONNECT_STEP_LABELS.get(step if ok else "vpn_failed")
+            if label:
+                self._window.set_connect_progress(label)
 
-        except Exception as e:
-            logger.exception("Error starting xray-core: %s", e)
-            if self._tray:
-                self._tray.show_notification("Error", f"Failed to start: {e}")
-            return False
+        return False
 
     def _reload_config(self) -> bool:
         """
@@ -314,6 +602,12 @@ class TengaApp:
         Returns:
             True if reload was successful, False otherwise
         """
+        # Waits for a connect worker that is starting xray-core right now
+        with self._runtime_lock:
+            return self._reload_config_locked()
+
+    def _reload_config_locked(self) -> bool:
+        """Reload configuration, with _runtime_lock held."""
         if not self._context.proxy_state.is_running:
             logger.debug("Proxy is not running, nothing to reload")
             return False
@@ -330,32 +624,73 @@ class TengaApp:
             logger.error("Failed to create configuration for reload")
             return False
 
-        config_path = self._context.config_dir / "current_config.json"
-        config_path.write_text(json.dumps(config, indent=2), encoding="utf-8")
-        logger.info("Reloaded configuration for profile id=%s, file: %s", profile_id, config_path)
+        serialized = self._context.xray_manager.serialize_config(config)
+        config_hash = self._save_current_config(serialized)
+        if config_hash == self._context.proxy_state.last_config_hash:
+            logger.info("Configuration unchanged for profile %s, no-op reload", profile_id)
+            return True
+
+        logger.info("Reloaded configuration for profile id=%s", profile_id)
 
         # Reload xray-core
         try:
-            success, error = self._context.xray_manager.reload_config(config)
+            success, error = self._context.xray_manager.reload_config(serialized)
             if not success:
                 logger.error("Error reloading xray-core: %s", error)
-                if self._tray:
-                    self._tray.show_notification("Ошибка", f"Не удалось перезагрузить: {error}")
+                self._notify("Ошибка", f"Не удалось перезагрузить: {error}")
                 return False
 
+            self._context.proxy_state.last_config_hash = config_hash
             logger.info("Configuration reloaded successfully")
-            if self._tray:
-                self._tray.show_notification("Конфигурация обновлена", "Настройки применены")
+            self._notify("Конфигурация обновлена", "Настройки применены")
             return True
 
         except Exception as e:
             logger.exception("Error reloading xray-core: %s", e)
-            if self._tray:
-                self._tray.show_notification("Ошибка", f"Не удалось перезагрузить: {e}")
+            self._notify("Ошибка", f"Не удалось перезагрузить: {e}")
             return False
 
+    def _save_current_config(self, serialized: bytes) -> bytes:
+        """
+        Save configuration to current_config.json for debugging.
+
+        The file is rewritten only when the serialized configuration differs
+        from the last one written.
+
+        Args:
+            serialized: Configuration from XrayManager.serialize_config()
+
+        Returns:
+            Digest of serialized configuration
+        """
+        config_hash = _config_digest(serialized)
+
+        config_path = self._context.config_dir / "current_config.json"
+        if config_hash != self._last_config_digest or not config_path.exists():
+            # Write next to the target and rename, so readers never see a partial file
+            tmp_path = config_path.with_suffix(".json.tmp")
+            tmp_path.write_bytes(serialized)
+            os.replace(tmp_path, config_path)
+            self._last_config_digest = config_hash
+            logger.info("Configuration saved to %s", config_path)
+        else:
+            logger.debug("Configuration unchanged, %s not rewritten", config_path)
+
+        return config_hash
+
     def _disconnect(self) -> None:
-        """Disconnect proxy."""
+        """Disconnect proxy, cancelling a connect that is still in flight."""
+        self._connect_cancel.set()
+        # Waits for a connect worker that is starting xray-core right now
+        with self._runtime_lock:
+            self._stop_runtime()
+        # Callbacks of the cancelled attempt are dropped, clear its progress here
+        if self._window:
+            self._window.set_connect_progress(None)
+        self._on_stopped()
+
+    def _stop_runtime(self) -> None:
+        """Stop xray-core, auto-connected VPN and system proxy (with _runtime_lock held)."""
         # Stop xray-core
         try:
             success, error = self._context.xray_manager.stop()
@@ -364,45 +699,110 @@ class TengaApp:
         except Exception as e:
             logger.exception("Exception when stopping xray-core: %s", e)
 
-        try:
-            profile_id = getattr(self._context.proxy_state, "started_profile_id", None)
-            if profile_id:
-                profile = self._context.profiles.get_profile(profile_id)
-                if profile and profile.vpn_settings:
-                    vpn_settings = profile.vpn_settings
-                    auto_flag = getattr(self._context.proxy_state, "vpn_auto_connected", False)
-                    if (
-                        vpn_settings.enabled
-                        and getattr(vpn_settings, "auto_connect", False)
-                        and auto_flag
-                    ):
-                        if disconnect_vpn(vpn_settings.connection_name):
-                            logger.info(
-                                "Auto-disconnected VPN '%s' after stopping profile",
-                                vpn_settings.connection_name,
-                            )
-                        else:
-                            logger.warning(
-                                "Failed to auto-disconnect VPN '%s' after stopping profile",
-                                vpn_settings.connection_name,
-                            )
-        except Exception as e:
-            logger.exception("Error during VPN auto-disconnect: %s", e)
-        finally:
+        connection_name, self._auto_connected_vpn = self._auto_connected_vpn, None
+        if connection_name:
             try:
-                self._context.proxy_state.vpn_auto_connected = False
-            except Exception:
-                pass
+                if disconnect_vpn(connection_name):
+                    logger.info(
+                        "Auto-disconnected VPN '%s' after stopping profile", connection_name
+                    )
+                else:
+                    logger.warning(
+                        "Failed to auto-disconnect VPN '%s' after stopping profile",
+                        connection_name,
+                    )
+            except Exception as e:
+                logger.exception("Error during VPN auto-disconnect: %s", e)
 
         clear_system_proxy()
+
+    def _on_stopped(self) -> bool:
+        """Mark proxy as stopped (runs in GTK main loop)."""
+        self._context.proxy_state.vpn_auto_connected = False
         # Update state
         self._context.proxy_state.set_stopped()
 
         if self._monitor:
             self._monitor.stop()
 
-        if self._tray:
-            self._tray.show_notification("Disconnected", "Proxy disconnected")
+        self._notify("Disconnected", "Proxy disconnected")
+        return False
+
+    def _notify(self, title: str, message: str) -> None:
+        """Show tray notification (safe to call from worker threads)."""
+        if not self._tray:
+            return
+        if threading.current_thread() is threading.main_thread():
+            self._queue_notification(title, message)
+        else:
+            GLib.idle_add(self._queue_notification, title, message)
+
+    def _queue_notification(self, title: str, message: str) -> bool:
+        """
+        Schedule notification, replacing one that is still pending.
+
+        Bursts (e.g. fast profile switching) end up as a single notification
+        with the latest message.
+        """
+        self._pending_notification = (title, message)
+        if self._notification_source is not None:
+            GLib.source_remove(self._notification_source)
+        self._notification_source = GLib.timeout_add(
+            _NOTIFICATION_DELAY_MS, self._flush_notification
+        )
+        return False
+
+    def _flush_notification(self) -> bool:
+        """Show pending notification (runs in GTK main loop)."""
+        if self._notification_source is not None:
+            GLib.source_remove(self._notification_source)
+            self._notification_source = None
+        pending, self._pending_notification = self._pending_notification, None
+        if pending and self._tray:
+            self._tray.show_notification(*pending)
+        return False
+
+    def _parse_routing_lists(self, routing: RoutingSettings) -> tuple[
+        tuple[list[str], list[str]],
+        tuple[list[str], list[str]],
+        tuple[list[str], list[str]],
+    ]:
+        """
+        Split routing lists into domains and IPs.
+
+        Parsing is pure, so results are memoized by list contents; live VPN
+        state is still checked by the caller on every build. parse_entries
+        already drops duplicates, and the lists are shared between builds,
+        so callers use them as they are and must not modify them.
+
+        Returns:
+            ((direct_domains, direct_ips), (vpn_domains, vpn_ips), (proxy_domains, proxy_ips))
+        """
+        key = (
+            routing.bypass_local_networks,
+            tuple(routing.direct_list),
+            tuple(routing.vpn_list),
+            tuple(routing.proxy_list),
+        )
+        cached = self._route_cache.get(key)
+        if cached is not None:
+            return cached
+
+        direct_list = routing.direct_list
+        if routing.bypass_local_networks:
+            direct_list = [*direct_list, *LOCAL_NETWORK_CIDRS]
+
+        empty: tuple[list[str], list[str]] = ([], [])
+        result = (
+            routing.parse_entries(direct_list) if direct_list else empty,
+            routing.parse_entries(routing.vpn_list) if routing.vpn_list else empty,
+            routing.parse_entries(routing.proxy_list) if routing.proxy_list else empty,
+        )
+
+        if len(self._route_cache) >= _ROUTE_CACHE_SIZE:
+            self._route_cache.clear()
+        self._route_cache[key] = result
+        return result
 
     def _create_config(self, profile: ProfileEntry) -> dict | None:
         """Create xray-core configuration for profile."""
@@ -432,6 +832,8 @@ class TengaApp:
 
             route_rules: list[dict] = []
             vpn_settings = profile.vpn_settings
+            vpn_enabled = bool(vpn_settings and vpn_settings.enabled)
+            vpn_connection_name = vpn_settings.connection_name if vpn_settings else ""
             vpn_tag = None
             vpn_interface = None
             over_vpn_domains_for_dns = []
@@ -443,12 +845,11 @@ class TengaApp:
             proxy_ips: list[str] = []
 
             # Process VPN routing rules (only if VPN is enabled and active)
-            if vpn_settings and vpn_settings.enabled:
-                if is_vpn_active(vpn_settings.connection_name):
-                    if vpn_settings.interface_name:
-                        vpn_interface = vpn_settings.interface_name
-                    else:
-                        vpn_interface = get_vpn_interface(vpn_settings.connection_name)
+            if vpn_enabled:
+                if is_vpn_active(vpn_connection_name):
+                    vpn_interface = vpn_settings.interface_name or get_vpn_interface(
+                        vpn_connection_name
+                    )
 
                     if vpn_interface:
                         vpn_tag = "vpn"
@@ -458,57 +859,28 @@ class TengaApp:
                 else:
                     logger.warning(
                         "VPN integration enabled but connection '%s' is not active",
-                        vpn_settings.connection_name,
+                        vpn_connection_name,
                     )
 
             if routing.mode == RoutingMode.PROXY_ALL:
                 if routing.bypass_local_networks:
-                    local_networks = [
-                        "127.0.0.0/8",
-                        "10.0.0.0/8",
-                        "172.16.0.0/12",
-                        "192.168.0.0/16",
-                        "169.254.0.0/16",
-                        "::1/128",
-                        "fc00::/7",
-                        "fe80::/10",
-                    ]
                     route_rules.append(
                         {
                             "type": "field",
-                            "ip": local_networks,
+                            "ip": list(LOCAL_NETWORK_CIDRS),
                             "outboundTag": "direct",
                         }
                     )
                     logger.debug("Added local networks bypass rule for PROXY_ALL mode")
             elif routing.mode == RoutingMode.CUSTOM:
-                direct_list = list(routing.direct_list) if routing.direct_list else []
-
-                if routing.bypass_local_networks:
-                    local_networks = [
-                        "127.0.0.0/8",
-                        "10.0.0.0/8",
-                        "172.16.0.0/12",
-                        "192.168.0.0/16",
-                        "169.254.0.0/16",
-                        "::1/128",
-                        "fc00::/7",
-                        "fe80::/10",
-                    ]
-                    for network in local_networks:
-                        if network not in direct_list:
-                            direct_list.append(network)
-                
-                if direct_list:
-                    direct_domains, direct_ips = routing.parse_entries(direct_list)
+                (
+                    (direct_domains, direct_ips),
+                    (vpn_domains, vpn_ips),
+                    (proxy_domains, proxy_ips),
+                ) = self._parse_routing_lists(routing)
 
-                if routing.vpn_list and vpn_tag and vpn_interface:
-                    vpn_domains, vpn_ips = routing.parse_entries(routing.vpn_list)
-                    if vpn_domains:
-                        over_vpn_domains_for_dns = vpn_domains
-
-                if routing.proxy_list:
-                    proxy_domains, proxy_ips = routing.parse_entries(routing.proxy_list)
+                if vpn_tag and vpn_interface and vpn_domains:
+                    over_vpn_domains_for_dns = vpn_domains
 
                 try:
                     rule_order = routing.get_rule_order()
@@ -517,91 +889,26 @@ class TengaApp:
 
                 for group in rule_order:
                     if group == "direct":
-                        if direct_ips:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "ip": direct_ips,
-                                    "outboundTag": "direct",
-                                }
-                            )
-                            logger.debug(
-                                "Added DIRECT routing from list for IPs (order %s): %s",
-                                rule_order,
-                                direct_ips,
-                            )
-                        if direct_domains:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "domain": direct_domains,
-                                    "outboundTag": "direct",
-                                }
-                            )
-                            logger.debug(
-                                "Added DIRECT routing from list for domains (order %s): %s",
-                                rule_order,
-                                direct_domains,
-                            )
+                        rules = _field_rules(direct_ips, direct_domains, "direct")
                     elif group == "vpn" and vpn_tag and vpn_interface:
-                        if vpn_ips:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "ip": vpn_ips,
-                                    "outboundTag": vpn_tag,
-                                }
-                            )
-                            logger.debug(
-                                "Added VPN routing from list for IPs (order %s): %s",
-                                rule_order,
-                                vpn_ips,
-                            )
-                        if vpn_domains:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "domain": vpn_domains,
-                                    "outboundTag": vpn_tag,
-                                }
-                            )
-                            logger.debug(
-                                "Added VPN routing from list for domains (order %s): %s",
-                                rule_order,
-                                vpn_domains,
-                            )
+                        rules = _field_rules(vpn_ips, vpn_domains, vpn_tag)
                     elif group == "proxy":
-                        if proxy_ips:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "ip": proxy_ips,
-                                    "outboundTag": proxy_tag,
-                                }
-                            )
-                            logger.debug(
-                                "Added PROXY routing from list for IPs (order %s): %s",
-                                rule_order,
-                                proxy_ips,
-                            )
-                        if proxy_domains:
-                            route_rules.append(
-                                {
-                                    "type": "field",
-                                    "domain": proxy_domains,
-                                    "outboundTag": proxy_tag,
-                                }
-                            )
-                            logger.debug(
-                                "Added PROXY routing from list for domains (order %s): %s",
-                                rule_order,
-                                proxy_domains,
-                            )
+                        rules = _field_rules(proxy_ips, proxy_domains, proxy_tag)
+                    else:
+                        continue
+                    if rules:
+                        route_rules.extend(rules)
+                        logger.debug(
+                            "Added %s routing from list (order %s): %s",
+                            group.upper(),
+                            rule_order,
+                            rules,
+                        )
 
             # Outbounds
             direct_outbound = {"protocol": "freedom", "tag": "direct"}
             if vpn_tag and vpn_interface and vpn_settings:
-                direct_interface = getattr(vpn_settings, "direct_interface", "") or ""
+                direct_interface = vpn_settings.direct_interface
                 if not direct_interface:
                     direct_interface = get_default_interface(vpn_interface)
 
@@ -617,17 +924,6 @@ class TengaApp:
                         vpn_interface,
                     )
 
-            if routing.mode == RoutingMode.PROXY_ALL:
-                outbounds = [
-                    outbound,
-                    direct_outbound,
-                ]
-            else:
-                outbounds = [
-                    outbound,
-                    direct_outbound,
-                ]
-
             if vpn_tag and vpn_interface:
                 vpn_outbound = {
                     "protocol": "freedom",
@@ -646,10 +942,12 @@ class TengaApp:
                     "Added VPN outbound with interface: %s",
                     vpn_interface,
                 )
-                outbounds.append(vpn_outbound)
+                outbounds = [outbound, direct_outbound, vpn_outbound]
+            else:
+                outbounds = [outbound, direct_outbound]
 
             if vpn_settings:
-                if vpn_settings.enabled:
+                if vpn_enabled:
                     if vpn_tag:
                         logger.info(
                             "Profile configuration: VPN enabled and active, proxy + VPN routing"
@@ -673,60 +971,11 @@ class TengaApp:
             dns_servers = []
 
             # Main DNS server
-            if dns_url == "local":
-                dns_servers.append(
-                    {
-                        "tag": "main-dns",
-                        "type": "local",
-                        "detour": dns_detour,
-                    }
-                )
-            elif dns_url.startswith("https://"):
-                # DoH server
-                from urllib.parse import urlparse
-
-                parsed = urlparse(dns_url)
-                server_host = parsed.netloc.split(":")[0] if ":" in parsed.netloc else parsed.netloc
-                server_port = parsed.port if parsed.port else 443
-                path = parsed.path if parsed.path else "/dns-query"
-
-                dns_servers.append(
-                    {
-                        "tag": "main-dns",
-                        "type": "https",
-                        "server": server_host,
-                        "server_port": server_port,
-                        "path": path,
-                        "detour": dns_detour,
-                    }
-                )
-            elif dns_url.startswith("tls://"):
-                # DoT server
-                server = dns_url.replace("tls://", "").split(":")[0]
-                port = 853
-                if ":" in dns_url.replace("tls://", ""):
-                    port = int(dns_url.split(":")[-1])
-
-                dns_servers.append(
-                    {
-                        "tag": "main-dns",
-                        "type": "tls",
-                        "server": server,
-                        "server_port": port,
-                        "detour": dns_detour,
-                    }
-                )
+            if "://" in dns_url:
+                scheme = dns_url.split("://", 1)[0]
             else:
-                # Plain IP or domain - use UDP
-                server = dns_url.replace("udp://", "").replace("tcp://", "")
-                dns_servers.append(
-                    {
-                        "tag": "main-dns",
-                        "type": "udp",
-                        "server": server,
-                        "detour": dns_detour,
-                    }
-                )
+                scheme = "local" if dns_url == "local" else "udp"
+            dns_servers.append(_DNS_BUILDERS.get(scheme, _build_udp_dns)(dns_url, dns_detour))
 
             # Local DNS server (no detour needed for local type)
             dns_servers.append(
@@ -738,37 +987,16 @@ class TengaApp:
 
             if vpn_tag and vpn_interface and over_vpn_domains_for_dns:
                 # Get DNS servers from VPN connection settings
-                vpn_dns_servers = get_vpn_dns_servers(vpn_settings.connection_name)
+                vpn_dns_servers = get_vpn_dns_servers(vpn_connection_name)
 
                 if vpn_dns_servers:
                     # Use first DNS server from VPN settings
                     vpn_dns_ip = vpn_dns_servers[0]
                     logger.debug("Raw VPN DNS server from NetworkManager: %s", vpn_dns_ip)
 
-                    # Clean up the address: remove protocol prefixes, brackets, etc.
-                    clean_ip = vpn_dns_ip.strip()
-
-                    # Remove protocol prefixes
-                    for prefix in ["udp://", "tcp://", "tls://", "https://"]:
-                        if clean_ip.startswith(prefix):
-                            clean_ip = clean_ip[len(prefix) :]
-
-                    # Remove brackets if present
-                    clean_ip = clean_ip.strip("[]")
-
-                    # Handle NetworkManager format like "IP4.DNS[1]:10.222.0.7:53" or "IP4.DNS[1]:10.222.0.7"
-                    # Extract IP address and port using regex-like approach
-                    import re
-
-                    # Pattern to match IP address (IPv4 or IPv6) with optional port
-                    ip_pattern = r"(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})(?::(\d+))?"
-                    ipv6_pattern = r"([0-9a-fA-F:]+)(?::(\d+))?"
-
-                    # Try to find IP address in the string
-                    match = re.search(ip_pattern, clean_ip)
-                    if not match:
-                        match = re.search(ipv6_pattern, clean_ip)
-
+                    # NetworkManager may report "10.222.0.7", "udp://10.222.0.7",
+                    # "[10.222.0.7]:53" or "IP4.DNS[1]:10.222.0.7:53"
+                    match = _VPN_DNS_RE.search(vpn_dns_ip)
                     if match:
                         server_ip = match.group(1)
                         server_port = int(match.group(2)) if match.group(2) else 53
@@ -779,46 +1007,7 @@ class TengaApp:
                             vpn_dns_ip,
                         )
                     else:
-                        # Fallback: try to extract by splitting on colons
-                        # Remove any non-IP prefix (like "IP4.DNS[1]:")
-                        parts = clean_ip.split(":")
-                        # Find the part that looks like an IP address
-                        for part in parts:
-                            # Check if part looks like an IP (contains dots or is IPv6)
-                            if "." in part or ":" in part:
-                                # This might be the IP
-                                ip_candidate = part
-                                port_candidate = 53
-                                # Check if next part is a number (port)
-                                part_idx = parts.index(part)
-                                if part_idx + 1 < len(parts):
-                                    try:
-                                        port_candidate = int(parts[part_idx + 1])
-                                    except (ValueError, IndexError):
-                                        pass
-
-                                # Validate IP format
-                                if re.match(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$", ip_candidate):
-                                    server_ip = ip_candidate
-                                    server_port = port_candidate
-                                    logger.debug(
-                                        "Extracted IP (fallback): %s, port: %d from: %s",
-                                        server_ip,
-                                        server_port,
-                                        vpn_dns_ip,
-                                    )
-                                    break
-                        else:
-                            # No valid IP found, use fallback
-                            logger.error("Could not extract IP address from: %s", vpn_dns_ip)
-                            server_ip = "8.8.8.8"
-                            server_port = 53
-
-                    # Final validation: server_ip should be a valid IP format
-                    if not re.match(r"^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$", server_ip):
-                        logger.error(
-                            "Invalid VPN DNS server IP format: %s (from: %s)", server_ip, vpn_dns_ip
-                        )
+                        logger.error("Could not extract IP address from: %s", vpn_dns_ip)
                         server_ip = "8.8.8.8"  # Fallback
                         server_port = 53
 
@@ -826,7 +1015,7 @@ class TengaApp:
                         "Using VPN DNS server %s:%d for over_vpn domains (from connection %s, original: %s, available: %s)",
                         server_ip,
                         server_port,
-                        vpn_settings.connection_name,
+                        vpn_connection_name,
                         vpn_dns_ip,
                         vpn_dns_servers,
                     )
@@ -845,7 +1034,7 @@ class TengaApp:
                     # Fallback to local DNS through VPN interface
                     logger.warning(
                         "No DNS servers found in VPN connection %s settings, using local DNS through VPN interface",
-                        vpn_settings.connection_name,
+                        vpn_connection_name,
                     )
                     dns_servers.append(
                         {
@@ -857,6 +1046,8 @@ class TengaApp:
                 logger.info("Added VPN DNS server for over_vpn domains")
 
             dns_rules = []
+            # Domains per DNS server tag, collected as rules are added
+            dns_server_domains: dict[str, list[str]] = {}
 
             # IMPORTANT: DNS rules are evaluated in order, so more specific rules should come first
             # 1. over_vpn domains should use VPN DNS (highest priority)
@@ -868,31 +1059,32 @@ class TengaApp:
                         "server": "vpn-dns",
                     }
                 )
+                dns_server_domains.setdefault("vpn-dns", []).extend(over_vpn_domains_for_dns)
                 logger.info(
                     "Added DNS rule for over_vpn domains (VPN DNS): %s", over_vpn_domains_for_dns
                 )
 
             # 2. VPS server domain should use local DNS
-            if vps_server and not vps_server[0].isdigit():
+            if vps_server and vps_server[0] not in _DIGITS:
                 dns_rules.append(
                     {
                         "domain": [vps_server],
                         "server": "local-dns",
                     }
                 )
+                dns_server_domains.setdefault("local-dns", []).append(vps_server)
 
             # Note: xray-core DNS configuration uses servers with optional domains, not separate rules
 
-            dns_config = {
-                "servers": dns_servers,
-                "rules": dns_rules,
-                "final": "main-dns",
-            }
-
             # Log DNS configuration for debugging (before conversion)
-            logger.info("DNS configuration (before xray-core conversion):")
-            logger.info("  Servers: %s", [s.get("tag", "unknown") for s in dns_servers])
-            logger.info("  Rules: %s", len(dns_rules))
+            logger.info(
+                "DNS configuration (before xray-core conversion): servers %s, %d rules",
+                [s.get("tag", "unknown") for s in dns_servers],
+                len(dns_rules),
+            )
+            # Rules carry full domain lists, so they are formatted only for debug logs
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("DNS rules:\n%s", _format_dns_rules(dns_rules))
 
             # Convert DNS config from sing-box format to xray-core format
             xray_dns_servers = []
@@ -914,13 +1106,7 @@ class TengaApp:
                         "port": port_num,
                     }
                     # Add domains from DNS rules if this server is referenced
-                    domains_for_server = []
-                    for rule in dns_rules:
-                        if rule.get("server") == server_tag:
-                            if "domain" in rule:
-                                domains_for_server.extend(rule["domain"])
-                            elif "domain_suffix" in rule:
-                                domains_for_server.extend(rule["domain_suffix"])
+                    domains_for_server = dns_server_domains.get(server_tag)
                     if domains_for_server:
                         server_config["domains"] = domains_for_server
                     # Note: xray-core doesn't support detour in DNS config directly
@@ -933,13 +1119,7 @@ class TengaApp:
                         "address": f"{addr}:{port_num}",
                     }
                     # Add domains from DNS rules if this server is referenced
-                    domains_for_server = []
-                    for rule in dns_rules:
-                        if rule.get("server") == server_tag:
-                            if "domain" in rule:
-                                domains_for_server.extend(rule["domain"])
-                            elif "domain_suffix" in rule:
-                                domains_for_server.extend(rule["domain_suffix"])
+                    domains_for_server = dns_server_domains.get(server_tag)
                     if domains_for_server:
                         server_config["domains"] = domains_for_server
                     xray_dns_servers.append(server_config)
@@ -952,13 +1132,7 @@ class TengaApp:
                         "path": path,
                     }
                     # Add domains from DNS rules if this server is referenced
-                    domains_for_server = []
-                    for rule in dns_rules:
-                        if rule.get("server") == server_tag:
-                            if "domain" in rule:
-                                domains_for_server.extend(rule["domain"])
-                            elif "domain_suffix" in rule:
-                                domains_for_server.extend(rule["domain_suffix"])
+                    domains_for_server = dns_server_domains.get(server_tag)
                     if domains_for_server:
                         server_config["domains"] = domains_for_server
                     xray_dns_servers.append(server_config)
@@ -1,12 +1,18 @@
-from src.ui.dialogs.add_profile import AddProfileDialog, show_add_profile_dialog
-from src.ui.dialogs.edit_group import EditGroupDialog, show_edit_group_dialog
-from src.ui.dialogs.edit_profile import EditProfileDialog, show_edit_profile_dialog
-from src.ui.dialogs.profile_vpn_settings import (
-    ProfileVpnSettingsDialog,
-    show_profile_vpn_settings_dialog,
-)
-from src.ui.dialogs.settings import SettingsDialog, show_settings_dialog
-from src.ui.dialogs.subscription import SubscriptionDialog, show_subscription_dialog
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.ui.dialogs.add_profile import AddProfileDialog, show_add_profile_dialog
+    from src.ui.dialogs.edit_group import EditGroupDialog, show_edit_group_dialog
+    from src.ui.dialogs.edit_profile import EditProfileDialog, show_edit_profile_dialog
+    from src.ui.dialogs.profile_vpn_settings import (
+        ProfileVpnSettingsDialog,
+        show_profile_vpn_settings_dialog,
+    )
+    from src.ui.dialogs.settings import SettingsDialog, show_settings_dialog
+    from src.ui.dialogs.subscription import SubscriptionDialog, show_subscription_dialog
 
 __all__ = [
     "AddProfileDialog",
@@ -22,3 +28,34 @@ __all__ = [
     "show_settings_dialog",
     "show_subscription_dialog",
 ]
+
+
+# Public name -> defining submodule; submodules are imported on first access
+_LAZY = {
+    "AddProfileDialog": "add_profile",
+    "show_add_profile_dialog": "add_profile",
+    "EditGroupDialog": "edit_group",
+    "show_edit_group_dialog": "edit_group",
+    "EditProfileDialog": "edit_profile",
+    "show_edit_profile_dialog": "edit_profile",
+    "ProfileVpnSettingsDialog": "profile_vpn_settings",
+    "show_profile_vpn_settings_dialog": "profile_vpn_settings",
+    "SettingsDialog": "settings",
+    "show_settings_dialog": "settings",
+    "SubscriptionDialog": "subscription",
+    "show_subscription_dialog": "subscription",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import gi
+
+gi.require_version("Gtk", "3.0")
+
+from gi.repository import Gtk
+
+
+def set_margins(widget: Gtk.Widget, margin: int) -> None:
+    """Set the same margin on all four sides of a widget."""
+    widget.set_property("margin", margin)
@@ -6,13 +6,16 @@ import gi
 
 gi.require_version("Gtk", "3.0")
 
-from gi.repository import Gdk, Gtk
+from gi.repository import Gdk, GLib, Gtk
 
 from src.fmt import parse_link
 
 if TYPE_CHECKING:
     from src.fmt import ProxyBean
 
+# Delay after the last keystroke before the link is parsed
+_PARSE_DELAY_MS = 150
+
 
 class AddProfileDialog(Gtk.Dialog):
     """Dialog for adding profile by share link."""
@@ -27,6 +30,7 @@ class AddProfileDialog(Gtk.Dialog):
         self.set_role("tenga-proxy")
         self.set_type_hint(Gdk.WindowTypeHint.DIALOG)
         self.connect("realize", self._on_realize)
+        self.connect("destroy", self._on_destroy)
 
         self.add_buttons(
             Gtk.STOCK_CANCEL,
@@ -43,6 +47,7 @@ class AddProfileDialog(Gtk.Dialog):
         self._name_entry: Gtk.Entry | None = None
         self._error_label: Gtk.Label | None = None
         self._parsed_bean: ProxyBean | None = None
+        self._parse_source: int | None = None
 
         self._setup_ui()
 
@@ -57,6 +62,12 @@ class AddProfileDialog(Gtk.Dialog):
             except Exception:
                 pass
 
+    def _on_destroy(self, widget: Gtk.Widget) -> None:
+        """Drop pending link parsing."""
+        if self._parse_source is not None:
+            GLib.source_remove(self._parse_source)
+            self._parse_source = None
+
     def _setup_ui(self) -> None:
         """Setup UI."""
         content = self.get_content_area()
@@ -114,14 +125,37 @@ class AddProfileDialog(Gtk.Dialog):
         self._link_entry.grab_focus()
 
     def _on_link_changed(self, entry: Gtk.Entry) -> None:
-        """Handle link change."""
-        link = entry.get_text().strip()
+        """Handle link change (parsing is debounced while typing)."""
+        if self._parse_source is not None:
+            GLib.source_remove(self._parse_source)
+            self._parse_source = None
 
-        if not link:
+        if not entry.get_text().strip():
             self._error_label.set_text("")
             self._parsed_bean = None
             return
 
+        self._parse_source = GLib.timeout_add(_PARSE_DELAY_MS, self._on_parse_timeout)
+
+    def _on_parse_timeout(self) -> bool:
+        """Parse link once typing has paused."""
+        self._parse_source = None
+        self._parse_link()
+        return False
+
+    def _flush_parse(self) -> None:
+        """Parse link now if parsing is still pending."""
+        if self._parse_source is not None:
+            GLib.source_remove(self._parse_source)
+            self._parse_source = None
+            self._parse_link()
+
+    def _parse_link(self) -> None:
+        """Parse entered link and show result."""
+        link = self._link_entry.get_text().strip()
+        if not link:
+            return
+
         bean = parse_link(link)
 
         if bean:
@@ -141,18 +175,23 @@ class AddProfileDialog(Gtk.Dialog):
 
     def _on_link_activate(self, entry: Gtk.Entry) -> None:
         """Enter in link field."""
+        self._flush_parse()
         if self._parsed_bean:
             self.response(Gtk.ResponseType.OK)
 
     def _on_paste_clicked(self, button: Gtk.Button) -> None:
-        """Paste from clipboard."""
+        """Paste from clipboard (without blocking on the clipboard owner)."""
         clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
-        text = clipboard.wait_for_text()
+        clipboard.request_text(self._on_clipboard_text)
+
+    def _on_clipboard_text(self, clipboard: Gtk.Clipboard, text: str | None) -> None:
+        """Clipboard text received."""
         if text:
             self._link_entry.set_text(text.strip())
 
     def get_profile(self) -> ProxyBean | None:
         """Get parsed profile."""
+        self._flush_parse()
         if not self._parsed_bean:
             return None
 
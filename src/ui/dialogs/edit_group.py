@@ -28,7 +28,6 @@ class EditGroupDialog(Gtk.Dialog):
         self.set_wmclass("tenga-proxy", "tenga-proxy")
         self.set_role("tenga-proxy")
         self.set_type_hint(Gdk.WindowTypeHint.DIALOG)
-        self.connect("realize", self._on_realize)
 
         self.add_buttons(
             Gtk.STOCK_CANCEL,
@@ -42,20 +41,22 @@ class EditGroupDialog(Gtk.Dialog):
         self.set_skip_taskbar_hint(True)
 
         self._group = group
+        self._info_label: Gtk.Label | None = None
         self._name_entry: Gtk.Entry | None = None
         self._error_label: Gtk.Label | None = None
+        # Widgets are built on first run(), see _ensure_ui
+        self._built = False
 
-        self._setup_ui()
+    def run(self) -> int:
+        """Build widgets if needed and run the dialog."""
+        self._ensure_ui()
+        return super().run()
 
-    def _on_realize(self, widget: Gtk.Widget) -> None:
-        """Handle window realization."""
-        window = self.get_window()
-        if window:
-            try:
-                window.set_wmclass("tenga-proxy", "tenga-proxy")
-                self.set_skip_taskbar_hint(True)
-            except Exception:
-                pass
+    def _ensure_ui(self) -> None:
+        """Build widgets once, when the dialog is about to be shown."""
+        if not self._built:
+            self._built = True
+            self._setup_ui()
 
     def _setup_ui(self) -> None:
         """Setup UI."""
@@ -66,47 +67,75 @@ class EditGroupDialog(Gtk.Dialog):
         content.set_margin_top(10)
         content.set_margin_bottom(10)
 
-        info_label = Gtk.Label()
-        if self._group and self._group.is_subscription:
-            info_label.set_markup("<b>Редактировать подписку</b>")
-        else:
-            info_label.set_markup("<b>Редактировать группу</b>")
-        info_label.set_halign(Gtk.Align.START)
-        content.pack_start(info_label, False, False, 0)
+        self._info_label = Gtk.Label()
+        self._info_label.show()
+        self._info_label.set_halign(Gtk.Align.START)
+        content.pack_start(self._info_label, False, False, 0)
 
-        name_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        content.pack_start(name_box, False, False, 5)
+        grid = Gtk.Grid()
+        grid.show()
+        grid.set_column_spacing(5)
+        content.pack_start(grid, False, False, 5)
 
         name_label = Gtk.Label(label="Название:")
+        name_label.show()
         name_label.set_width_chars(12)
         name_label.set_halign(Gtk.Align.END)
-        name_box.pack_start(name_label, False, False, 0)
+        grid.attach(name_label, 0, 0, 1, 1)
 
         self._name_entry = Gtk.Entry()
+        self._name_entry.show()
         self._name_entry.set_placeholder_text("Название группы")
-        if self._group:
-            self._name_entry.set_text(self._group.name)
-        name_box.pack_start(self._name_entry, True, True, 0)
+        self._name_entry.set_hexpand(True)
+        grid.attach(self._name_entry, 1, 0, 1, 1)
 
+        # Shown by get_group_name() when the name is empty
         self._error_label = Gtk.Label()
+        self._error_label.set_markup('<span color="red">[ERROR] Введите название группы</span>')
         self._error_label.set_halign(Gtk.Align.START)
         self._error_label.set_line_wrap(True)
         content.pack_start(self._error_label, False, False, 5)
 
-        content.show_all()
+        self._fill()
+
+    def _fill(self) -> None:
+        """Show current group in widgets."""
+        if self._group and self._group.is_subscription:
+            self._info_label.set_markup("<b>Редактировать подписку</b>")
+        else:
+            self._info_label.set_markup("<b>Редактировать группу</b>")
+
+        self._name_entry.set_text(self._group.name if self._group else "")
+        self._error_label.hide()
 
         self._name_entry.grab_focus()
         self._name_entry.select_region(0, -1)
 
+    def load(self, group: ProfileGroup | None) -> None:
+        """Switch dialog to another group (used when the dialog is reused)."""
+        self._group = group
+        if self._built:
+            self._fill()
+
     def get_group_name(self) -> str | None:
         """Get group name."""
-        name = self._name_entry.get_text().strip()
+        self._ensure_ui()
+        name = self._name_entry.get_text()
 
-        if not name:
-            self._error_label.set_markup('<span color="red">[ERROR] Введите название группы</span>')
+        if not name or name.isspace():
+            self._error_label.show()
             return None
 
-        return name
+        return name.strip()
+
+
+# Dialog reused between calls, see show_edit_group_dialog
+_dialog: EditGroupDialog | None = None
+
+
+def _forget_dialog(widget: Gtk.Widget) -> None:
+    global _dialog
+    _dialog = None
 
 
 def show_edit_group_dialog(
@@ -123,12 +152,20 @@ def show_edit_group_dialog(
     Returns:
         New group name if edited, None if cancelled
     """
-    dialog = EditGroupDialog(parent, group)
-    response = dialog.run()
+    global _dialog
+    if _dialog is None:
+        _dialog = EditGroupDialog(parent, group)
+        _dialog.connect("delete-event", Gtk.Widget.hide_on_delete)
+        _dialog.connect("destroy", _forget_dialog)
+    else:
+        _dialog.set_transient_for(parent)
+        _dialog.load(group)
+
+    response = _dialog.run()
 
     result = None
     if response == Gtk.ResponseType.OK:
-        result = dialog.get_group_name()
+        result = _dialog.get_group_name()
 
-    dialog.destroy()
+    _dialog.hide()
     return result
@@ -11,6 +11,14 @@ from gi.repository import Gdk, Gtk
 if TYPE_CHECKING:
     from src.db.profiles import ProfileEntry
 
+# Port spin button bounds
+_PORT_RANGE = {
+    "lower": 1.0,
+    "upper": 65535.0,
+    "step_increment": 1.0,
+    "page_increment": 10.0,
+}
+
 
 class EditProfileDialog(Gtk.Dialog):
     """Dialog for editing basic profile parameters."""
@@ -44,8 +52,10 @@ class EditProfileDialog(Gtk.Dialog):
         self._name_entry: Gtk.Entry | None = None
         self._address_entry: Gtk.Entry | None = None
         self._port_entry: Gtk.SpinButton | None = None
-
-        self._setup_ui()
+        # (name, address, port) as shown when the dialog was filled
+        self._shown: tuple[str, str, int] = ("", "", 0)
+        # Widgets are built on first run(), see _ensure_ui
+        self._built = False
 
     def _on_realize(self, widget: Gtk.Widget) -> None:
         """Handle window realization - set WM_CLASS via Gdk.Window."""
@@ -57,6 +67,17 @@ class EditProfileDialog(Gtk.Dialog):
             except Exception:
                 pass
 
+    def run(self) -> int:
+        """Build widgets if needed and run the dialog."""
+        self._ensure_ui()
+        return super().run()
+
+    def _ensure_ui(self) -> None:
+        """Build widgets once, when the dialog is about to be shown."""
+        if not self._built:
+            self._built = True
+            self._setup_ui()
+
     def _setup_ui(self) -> None:
         """Setup UI."""
         content = self.get_content_area()
@@ -66,70 +87,103 @@ class EditProfileDialog(Gtk.Dialog):
         content.set_margin_top(10)
         content.set_margin_bottom(10)
 
-        bean = self._profile.bean
-
-        name_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        content.pack_start(name_box, False, False, 5)
+        grid = Gtk.Grid()
+        grid.show()
+        grid.set_row_spacing(10)
+        grid.set_column_spacing(5)
+        content.pack_start(grid, False, False, 5)
 
         name_label = Gtk.Label(label="Имя:")
+        name_label.show()
         name_label.set_width_chars(10)
         name_label.set_halign(Gtk.Align.END)
-        name_box.pack_start(name_label, False, False, 0)
+        grid.attach(name_label, 0, 0, 1, 1)
 
         self._name_entry = Gtk.Entry()
-        self._name_entry.set_text(bean.display_name)
-        name_box.pack_start(self._name_entry, True, True, 0)
-
-        addr_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        content.pack_start(addr_box, False, False, 5)
+        self._name_entry.show()
+        self._name_entry.set_hexpand(True)
+        grid.attach(self._name_entry, 1, 0, 1, 1)
 
         addr_label = Gtk.Label(label="Сервер:")
+        addr_label.show()
         addr_label.set_width_chars(10)
         addr_label.set_halign(Gtk.Align.END)
-        addr_box.pack_start(addr_label, False, False, 0)
+        grid.attach(addr_label, 0, 1, 1, 1)
 
         self._address_entry = Gtk.Entry()
-        self._address_entry.set_text(str(bean.server_address))
-        addr_box.pack_start(self._address_entry, True, True, 0)
-
-        port_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
-        content.pack_start(port_box, False, False, 5)
+        self._address_entry.show()
+        self._address_entry.set_hexpand(True)
+        grid.attach(self._address_entry, 1, 1, 1, 1)
 
         port_label = Gtk.Label(label="Порт:")
+        port_label.show()
         port_label.set_width_chars(10)
         port_label.set_halign(Gtk.Align.END)
-        port_box.pack_start(port_label, False, False, 0)
-
-        adjustment = Gtk.Adjustment(
-            value=float(bean.server_port),
-            lower=1.0,
-            upper=65535.0,
-            step_increment=1.0,
-            page_increment=10.0,
-        )
-        self._port_entry = Gtk.SpinButton()
-        self._port_entry.set_adjustment(adjustment)
+        grid.attach(port_label, 0, 2, 1, 1)
+
+        self._port_entry = Gtk.SpinButton(adjustment=Gtk.Adjustment(**_PORT_RANGE))
+        self._port_entry.show()
         self._port_entry.set_numeric(True)
-        port_box.pack_start(self._port_entry, False, False, 0)
+        self._port_entry.set_halign(Gtk.Align.START)
+        grid.attach(self._port_entry, 1, 2, 1, 1)
+
+        self._fill()
 
-        content.show_all()
+    def _fill(self) -> None:
+        """Show current profile in widgets."""
+        bean = self._profile.bean
+        self._shown = (bean.display_name, bean.server_address, int(bean.server_port))
+        self._name_entry.set_text(self._shown[0])
+        self._address_entry.set_text(self._shown[1])
+        self._port_entry.set_value(float(self._shown[2]))
+
+    def load(self, profile: ProfileEntry) -> None:
+        """Switch dialog to another profile (used when the dialog is reused)."""
+        self._profile = profile
+        if self._built:
+            self._fill()
 
-    def apply_changes(self) -> None:
-        """Apply changes to profile."""
+    def apply_changes(self) -> bool:
+        """
+        Apply changes to profile.
+
+        Only fields edited by the user are written back.
+
+        Returns:
+            True if the profile was modified
+        """
         bean = self._profile.bean
+        shown_name, shown_address, shown_port = self._shown
+        changed = False
 
         if self._name_entry is not None:
             name = self._name_entry.get_text().strip()
-            bean.name = name
+            if name != shown_name:
+                bean.name = name
+                changed = True
 
         if self._address_entry is not None:
             address = self._address_entry.get_text().strip()
-            if address:
+            if address and address != shown_address:
                 bean.server_address = address
+                changed = True
 
         if self._port_entry is not None:
-            port = int(self._port_entry.get_value())
-            bean.server_port = port
+            port = self._port_entry.get_value_as_int()
+            if port != shown_port:
+                bean.server_port = port
+                changed = True
+
+        return changed
+
+
+# Dialog reused between calls, see show_edit_profile_dialog
+_dialog: EditProfileDialog | None = None
+
+
+def _forget_dialog(widget: Gtk.Widget) -> None:
+    global _dialog
+    _dialog = None
 
 
 def show_edit_profile_dialog(
@@ -140,15 +194,22 @@ def show_edit_profile_dialog(
     Show edit profile dialog.
 
     Returns:
-        True if changes applied, False if cancelled.
+        True if the profile was changed, False if cancelled or left as is.
     """
-    dialog = EditProfileDialog(profile, parent)
-    response = dialog.run()
+    global _dialog
+    if _dialog is None:
+        _dialog = EditProfileDialog(profile, parent)
+        _dialog.connect("delete-event", Gtk.Widget.hide_on_delete)
+        _dialog.connect("destroy", _forget_dialog)
+    else:
+        _dialog.set_transient_for(parent)
+        _dialog.load(profile)
+
+    response = _dialog.run()
 
     changed = False
     if response == Gtk.ResponseType.OK:
-        dialog.apply_changes()
-        changed = True
+        changed = _dialog.apply_changes()
 
-    dialog.destroy()
+    _dialog.hide()
     return changed
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+import threading
 from collections.abc import Callable
 from typing import TYPE_CHECKING
 
@@ -8,15 +9,17 @@ import gi
 
 gi.require_version("Gtk", "3.0")
 
-from gi.repository import Gdk, Gtk, Pango
+from gi.repository import Gdk, GLib, Gtk, Pango
 
-from src.db.config import RoutingMode, RoutingSettings, VpnSettings
+from src.db.config import LOCAL_NETWORK_CIDRS, RoutingMode, RoutingSettings, VpnSettings
 from src.sys.vpn import (
+    cached_network_interfaces,
+    cached_vpn_connections,
     get_vpn_interface,
+    invalidate_list_cache,
     is_vpn_active,
-    list_network_interfaces,
-    list_vpn_connections,
 )
+from src.ui.dialogs._widgets import set_margins
 from src.db.config import DEFAULT_ROUTING_ORDER
 
 
@@ -25,10 +28,41 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger("tenga.ui.profile_vpn_settings")
 
+_LOCAL_NETWORKS_SET = frozenset(LOCAL_NETWORK_CIDRS)
+
+# VPN name completion model shared by dialogs while the connection list is unchanged
+_VPN_COMPLETION_CACHE: dict[tuple[str, ...], Gtk.ListStore] = {}
+
+
+def _vpn_completion_store(vpn_names: list[str]) -> Gtk.ListStore:
+    """Get completion model for VPN names, reusing the last one built."""
+    key = tuple(vpn_names)
+    store = _VPN_COMPLETION_CACHE.get(key)
+    if store is None:
+        # Fill the store before it is attached, so no view listens to row signals
+        store = Gtk.ListStore(str)
+        for name in vpn_names:
+            store.insert_with_values(-1, [0], [name])
+        _VPN_COMPLETION_CACHE.clear()
+        _VPN_COMPLETION_CACHE[key] = store
+    return store
+
 
 class ProfileVpnSettingsDialog(Gtk.Dialog):
     """VPN settings dialog for a specific profile."""
 
+    # Font of routing list text views
+    _MONO_FONT = Pango.FontDescription("monospace 10")
+
+    # VPN status markup
+    _STATUS_CHECKING = "<span color='gray'>●</span> Проверка…"
+    _STATUS_CONNECTED = "<span color='green'>●</span> <b>Подключено</b> (интерфейс: {})"
+    _STATUS_CONNECTED_NO_IFACE = (
+        "<span color='green'>●</span> <b>Подключено</b> (интерфейс не определён)"
+    )
+    _STATUS_DISCONNECTED = "<span color='red'>●</span> <b>Не подключено</b>"
+    _STATUS_UNKNOWN = "—"
+
     def __init__(self, profile: ProfileEntry, parent: Gtk.Window | None = None):
         super().__init__(
             title=f"Настройки VPN - {profile.name}",
@@ -38,7 +72,6 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         self.set_wmclass("tenga-proxy", "tenga-proxy")
         self.set_role("tenga-proxy")
         self.set_type_hint(Gdk.WindowTypeHint.DIALOG)
-        self.connect("realize", self._on_realize)
 
         self.add_buttons(
             Gtk.STOCK_CANCEL,
@@ -53,62 +86,116 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
 
         self._profile = profile
         self._routing = profile.routing_settings or RoutingSettings()
-
-        self._setup_ui()
-        self._load_settings()
-
-    def _on_realize(self, widget: Gtk.Widget) -> None:
-        """Handle window realization - set WM_CLASS via Gdk.Window."""
-        window = self.get_window()
-        if window:
-            try:
-                window.set_wmclass("tenga-proxy", "tenga-proxy")
-                self.set_skip_taskbar_hint(True)
-            except Exception:
-                pass
+        self._destroyed = False
+        self._refresh_pending = False
+        self._error_dialog: Gtk.MessageDialog | None = None
+        # Connection names listed for the completion, reused to validate on save
+        self._available_vpn_connections: list[str] = []
+        # Connection name the profile was saved with while integration was enabled
+        self._accepted_connection_name: str | None = None
+        self.connect("destroy", self._on_destroy)
+
+        # VPN and routing pages are built on first switch to their tab
+        self._lazy_pages: dict[Gtk.Widget, Callable[[], Gtk.Widget]] = {}
+        self._vpn_enable_check: Gtk.CheckButton | None = None
+
+        # Routing page widgets, None until the page is built
+        self._routing_radios: dict[str, Gtk.RadioButton] | None = None
+        self._routing_order_combo: Gtk.ComboBoxText | None = None
+        self._proxy_list_text: Gtk.TextView | None = None
+        self._direct_list_text: Gtk.TextView | None = None
+        self._vpn_list_text: Gtk.TextView | None = None
+        self._bypass_local_check: Gtk.CheckButton | None = None
+        # Parsed list lines per buffer, dropped whenever the buffer changes
+        self._lines_cache: dict[Gtk.TextBuffer, list[str]] = {}
+        # Direct and VPN list contents waiting to be filled after the first paint
+        self._pending_lists: tuple[list[str], list[str]] | None = None
+        self._pending_lists_source: int | None = None
+
+        # Widgets are built on first run()
+        self._built = False
+
+    def run(self) -> int:
+        """Build widgets if needed and run the dialog."""
+        self._ensure_ui()
+        return super().run()
+
+    def _ensure_ui(self) -> None:
+        """Build widgets once, when the dialog is about to be shown."""
+        if not self._built:
+            self._built = True
+            self._setup_ui()
 
     def _setup_ui(self) -> None:
         """Setup UI."""
         content = self.get_content_area()
         content.set_spacing(0)
 
+        # Tree is built detached and parented once complete
         notebook = Gtk.Notebook()
-        content.pack_start(notebook, True, True, 0)
 
         # Profile settings
         profile_page = self._create_profile_page()
         notebook.append_page(profile_page, Gtk.Label(label="Профиль"))
 
-        # VPN settings
-        vpn_page = self._create_vpn_page()
-        notebook.append_page(vpn_page, Gtk.Label(label="VPN"))
-
-        # Routing settings
-        routing_page = self._create_routing_page()
-        notebook.append_page(routing_page, Gtk.Label(label="Маршруты"))
+        # VPN and routing settings fill their empty holders when first shown
+        for build, tab_label in (
+            (self._build_vpn_page, "VPN"),
+            (self._build_routing_page, "Маршруты"),
+        ):
+            holder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            self._lazy_pages[holder] = build
+            notebook.append_page(holder, Gtk.Label(label=tab_label))
 
+        notebook.connect("switch-page", self._on_page_switched)
+        content.pack_start(notebook, True, True, 0)
         content.show_all()
 
+    def _on_page_switched(self, notebook: Gtk.Notebook, page: Gtk.Widget, page_num: int) -> None:
+        """Build a lazy page the first time its tab is selected."""
+        build = self._lazy_pages.pop(page, None)
+        if build is None:
+            return
+        built = build()
+        page.pack_start(built, True, True, 0)
+        built.show_all()
+
+    def _build_vpn_page(self) -> Gtk.Widget:
+        """Create and load VPN settings page."""
+        page = self._create_vpn_page()
+        self._load_vpn_settings()
+        # VPN connections and interfaces come from nmcli/ip, query them off the UI thread
+        thread = threading.Thread(target=self._query_system_lists, daemon=True)
+        thread.start()
+        return page
+
+    def _build_routing_page(self) -> Gtk.Widget:
+        """Create and load routing settings page."""
+        page = self._create_routing_page()
+        self._load_routing_settings()
+        return page
+
+    @staticmethod
+    def _mklabel(text: str, halign: Gtk.Align = Gtk.Align.END) -> Gtk.Label:
+        """Create a plain text label with the given alignment."""
+        label = Gtk.Label.new(text)
+        label.set_halign(halign)
+        return label
+
     def _create_profile_page(self) -> Gtk.Widget:
         """Create profile settings page."""
         scrolled = Gtk.ScrolledWindow()
         scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         profile_frame = Gtk.Frame()
         profile_frame.set_label("Профиль")
         box.pack_start(profile_frame, False, False, 0)
 
         profile_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        profile_box.set_margin_start(10)
-        profile_box.set_margin_end(10)
-        profile_box.set_margin_top(10)
-        profile_box.set_margin_bottom(10)
+        set_margins(profile_box, 10)
         profile_frame.add(profile_box)
 
         name_grid = Gtk.Grid()
@@ -116,16 +203,12 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         name_grid.set_column_spacing(10)
         profile_box.pack_start(name_grid, False, False, 0)
 
-        name_grid.attach(
-            Gtk.Label(label="Имя профиля:", halign=Gtk.Align.END), 0, 0, 1, 1
-        )
+        name_grid.attach(self._mklabel("Имя профиля:"), 0, 0, 1, 1)
         self._profile_name_entry = Gtk.Entry()
         self._profile_name_entry.set_text(self._profile.name)
         self._profile_name_entry.set_tooltip_text("Имя профиля для отображения в списке")
         name_grid.attach(self._profile_name_entry, 1, 0, 1, 1)
 
-        box.pack_start(Gtk.Box(), True, True, 0)
-
         scrolled.add(box)
         return scrolled
 
@@ -135,20 +218,14 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         enable_frame = Gtk.Frame()
         enable_frame.set_label("Интеграция VPN")
         box.pack_start(enable_frame, False, False, 0)
 
         enable_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        enable_box.set_margin_start(10)
-        enable_box.set_margin_end(10)
-        enable_box.set_margin_top(10)
-        enable_box.set_margin_bottom(10)
+        set_margins(enable_box, 10)
         enable_frame.add(enable_box)
 
         self._vpn_enable_check = Gtk.CheckButton(label="Включить интеграцию VPN")
@@ -166,68 +243,38 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         connection_grid = Gtk.Grid()
         connection_grid.set_row_spacing(8)
         connection_grid.set_column_spacing(10)
-        connection_grid.set_margin_start(10)
-        connection_grid.set_margin_end(10)
-        connection_grid.set_margin_top(10)
-        connection_grid.set_margin_bottom(10)
+        set_margins(connection_grid, 10)
         connection_frame.add(connection_grid)
 
-        connection_grid.attach(
-            Gtk.Label(label="Имя подключения:", halign=Gtk.Align.END), 0, 0, 1, 1
-        )
+        connection_grid.attach(self._mklabel("Имя подключения:"), 0, 0, 1, 1)
         self._vpn_connection_entry = Gtk.Entry()
         self._vpn_connection_entry.set_placeholder_text("aiso")
         self._vpn_connection_entry.set_tooltip_text("Имя VPN подключения в NetworkManager")
         connection_grid.attach(self._vpn_connection_entry, 1, 0, 1, 1)
 
-        try:
-            vpn_names = list_vpn_connections()
-        except Exception:
-            vpn_names = []
-
-        if vpn_names:
-            store = Gtk.ListStore(str)
-            for name in vpn_names:
-                store.append([name])
-            completion = Gtk.EntryCompletion()
-            completion.set_model(store)
-            completion.set_text_column(0)
-            completion.set_inline_completion(True)
-            completion.set_inline_selection(True)
-            self._vpn_connection_entry.set_completion(completion)
-
-        connection_grid.attach(Gtk.Label(label="Интерфейс VPN:", halign=Gtk.Align.END), 0, 1, 1, 1)
+        connection_grid.attach(self._mklabel("Интерфейс VPN:"), 0, 1, 1, 1)
         self._vpn_interface_combo = Gtk.ComboBoxText()
         self._vpn_interface_combo.set_tooltip_text(
             "Выберите интерфейс VPN. 'Автоопределение' - автоматический выбор."
         )
         self._vpn_interface_combo.append_text("Автоопределение")
         self._vpn_interface_combo.set_active(0)
-        try:
-            interfaces = list_network_interfaces()
-            for iface in interfaces:
-                self._vpn_interface_combo.append_text(iface)
-        except Exception:
-            pass
         connection_grid.attach(self._vpn_interface_combo, 1, 1, 1, 1)
 
-        connection_grid.attach(
-            Gtk.Label(label="Интерфейс Direct:", halign=Gtk.Align.END), 0, 2, 1, 1
-        )
+        connection_grid.attach(self._mklabel("Интерфейс Direct:"), 0, 2, 1, 1)
         self._direct_interface_combo = Gtk.ComboBoxText()
         self._direct_interface_combo.set_tooltip_text(
             "Выберите интерфейс для прямого трафика (обход VPN). 'Автоопределение' - автоматический выбор."
         )
         self._direct_interface_combo.append_text("Автоопределение")
         self._direct_interface_combo.set_active(0)
-        try:
-            interfaces = list_network_interfaces()
-            for iface in interfaces:
-                self._direct_interface_combo.append_text(iface)
-        except Exception:
-            pass
         connection_grid.attach(self._direct_interface_combo, 1, 2, 1, 1)
 
+        # Combo row of each interface name, row 0 is auto-detection.
+        # Interfaces are appended by _apply_system_lists once they are known.
+        self._vpn_iface_index: dict[str, int] = {"Автоопределение": 0}
+        self._direct_iface_index: dict[str, int] = {"Автоопределение": 0}
+
         self._vpn_auto_connect_check = Gtk.CheckButton(label="Подключать VPN при запуске профиля")
         self._vpn_auto_connect_check.set_tooltip_text(
             "Перед запуском профиля автоматически выполнять включать VPN"
@@ -241,9 +288,7 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         status_box.set_margin_bottom(5)
         connection_frame.add(status_box)
 
-        status_label = Gtk.Label(label="Статус:")
-        status_label.set_halign(Gtk.Align.START)
-        status_box.pack_start(status_label, False, False, 0)
+        status_box.pack_start(self._mklabel("Статус:", Gtk.Align.START), False, False, 0)
 
         self._vpn_status_label = Gtk.Label()
         self._vpn_status_label.set_halign(Gtk.Align.START)
@@ -253,8 +298,6 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         refresh_btn.connect("clicked", self._on_vpn_refresh_clicked)
         status_box.pack_end(refresh_btn, False, False, 0)
 
-        box.pack_start(Gtk.Box(), True, True, 0)
-
         scrolled.add(box)
         return scrolled
 
@@ -264,10 +307,7 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         # Routing mode
         mode_frame = Gtk.Frame()
@@ -275,13 +315,13 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         box.pack_start(mode_frame, False, False, 0)
 
         mode_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        mode_box.set_margin_start(10)
-        mode_box.set_margin_end(10)
-        mode_box.set_margin_top(10)
-        mode_box.set_margin_bottom(10)
+        set_margins(mode_box, 10)
         mode_frame.add(mode_box)
 
         self._routing_radios = {}
+        self._routing_radio_handlers: dict[str, int] = {}
+        # Kept up to date by _on_routing_mode_changed; the first radio starts active
+        self._active_routing_mode = RoutingMode.ALL[0]
         first_radio = None
 
         for mode in RoutingMode.ALL:
@@ -293,7 +333,9 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
                     first_radio, RoutingMode.LABELS[mode]
                 )
 
-            radio.connect("toggled", self._on_routing_mode_changed)
+            self._routing_radio_handlers[mode] = radio.connect(
+                "toggled", self._on_routing_mode_changed, mode
+            )
             self._routing_radios[mode] = radio
 
             desc_label = Gtk.Label()
@@ -312,14 +354,10 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         box.pack_start(order_frame, False, False, 0)
 
         order_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        order_box.set_margin_start(10)
-        order_box.set_margin_end(10)
-        order_box.set_margin_top(10)
-        order_box.set_margin_bottom(10)
+        set_margins(order_box, 10)
         order_frame.add(order_box)
 
-        order_label = Gtk.Label(label="Приоритет групп маршрутов:")
-        order_label.set_halign(Gtk.Align.START)
+        order_label = self._mklabel("Приоритет групп маршрутов:", Gtk.Align.START)
         order_box.pack_start(order_label, False, False, 0)
 
         self._routing_order_combo = Gtk.ComboBoxText.new()
@@ -354,154 +392,158 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
         box.pack_start(lists_frame, True, True, 0)
 
         lists_notebook = Gtk.Notebook()
-        lists_notebook.set_margin_start(10)
-        lists_notebook.set_margin_end(10)
-        lists_notebook.set_margin_top(10)
-        lists_notebook.set_margin_bottom(10)
+        set_margins(lists_notebook, 10)
         lists_frame.add(lists_notebook)
 
-        proxy_scroll = Gtk.ScrolledWindow()
-        proxy_scroll.set_shadow_type(Gtk.ShadowType.IN)
-        proxy_scroll.set_min_content_height(200)
-        self._proxy_list_text = Gtk.TextView()
-        self._proxy_list_text.set_wrap_mode(Gtk.WrapMode.WORD)
-        self._proxy_list_text.modify_font(Pango.FontDescription("monospace 10"))
-        proxy_scroll.add(self._proxy_list_text)
-
-        proxy_hint = Gtk.Label()
-        proxy_hint.set_markup(
-            "<small>Домены и IP-адреса, которые должны идти через прокси.\n"
-            "Одна запись на строку. Примеры:\n"
-            "  • <tt>example.com</tt>\n"
-            "  • <tt>192.168.1.0/24</tt></small>"
-        )
-        proxy_hint.set_halign(Gtk.Align.START)
-        proxy_hint.get_style_context().add_class("dim-label")
-
-        proxy_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        proxy_box.set_margin_start(5)
-        proxy_box.set_margin_end(5)
-        proxy_box.set_margin_top(5)
-        proxy_box.set_margin_bottom(5)
-        proxy_box.pack_start(proxy_hint, False, False, 0)
-        proxy_box.pack_start(proxy_scroll, True, True, 0)
-        lists_notebook.append_page(proxy_box, Gtk.Label(label="Через прокси"))
-
-        direct_scroll = Gtk.ScrolledWindow()
-        direct_scroll.set_shadow_type(Gtk.ShadowType.IN)
-        direct_scroll.set_min_content_height(200)
-        self._direct_list_text = Gtk.TextView()
-        self._direct_list_text.set_wrap_mode(Gtk.WrapMode.WORD)
-        self._direct_list_text.modify_font(Pango.FontDescription("monospace 10"))
-        direct_scroll.add(self._direct_list_text)
-
-        direct_hint = Gtk.Label()
-        direct_hint.set_markup(
-            "<small>Домены и IP-адреса, которые должны идти напрямую (без прокси и VPN).\n"
-            "Одна запись на строку. Примеры:\n"
-            "  • <tt>local.example.com</tt>\n"
-            "  • <tt>10.0.0.0/8</tt></small>"
-        )
-        direct_hint.set_halign(Gtk.Align.START)
-        direct_hint.get_style_context().add_class("dim-label")
-
-        direct_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        direct_box.set_margin_start(5)
-        direct_box.set_margin_end(5)
-        direct_box.set_margin_top(5)
-        direct_box.set_margin_bottom(5)
-        direct_box.pack_start(direct_hint, False, False, 0)
-
         self._bypass_local_check = Gtk.CheckButton(label="Добавить локальные сети")
         self._bypass_local_check.set_tooltip_text(
             "Автоматически добавлять локальные сети (127.0.0.0/8, 192.168.0.0/16, etc.) в список"
         )
         self._bypass_local_check.set_can_focus(False)
         self._bypass_local_check.connect("toggled", self._on_bypass_local_changed)
-        direct_box.pack_start(self._bypass_local_check, False, False, 0)
-        
-        direct_box.pack_start(direct_scroll, True, True, 0)
-        lists_notebook.append_page(direct_box, Gtk.Label(label="Напрямую"))
-
-        vpn_scroll = Gtk.ScrolledWindow()
-        vpn_scroll.set_shadow_type(Gtk.ShadowType.IN)
-        vpn_scroll.set_min_content_height(200)
-        self._vpn_list_text = Gtk.TextView()
-        self._vpn_list_text.set_wrap_mode(Gtk.WrapMode.WORD)
-        self._vpn_list_text.modify_font(Pango.FontDescription("monospace 10"))
-        vpn_scroll.add(self._vpn_list_text)
-
-        vpn_hint = Gtk.Label()
-        vpn_hint.set_markup(
-            "<small>Домены и IP-адреса, которые должны идти через VPN.\n"
-            "Доступно только если включена интеграция VPN.\n"
-            "Одна запись на строку. Примеры:\n"
-            "  • <tt>vpn.example.com</tt>\n"
-            "  • <tt>172.16.0.0/12</tt></small>"
-        )
-        vpn_hint.set_halign(Gtk.Align.START)
-        vpn_hint.get_style_context().add_class("dim-label")
 
-        vpn_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        vpn_box.set_margin_start(5)
-        vpn_box.set_margin_end(5)
-        vpn_box.set_margin_top(5)
-        vpn_box.set_margin_bottom(5)
-        vpn_box.pack_start(vpn_hint, False, False, 0)
-        vpn_box.pack_start(vpn_scroll, True, True, 0)
-        lists_notebook.append_page(vpn_box, Gtk.Label(label="Через VPN"))
+        # (text view attribute, tab label, hint markup, widget between hint and list)
+        list_pages = (
+            (
+                "_proxy_list_text",
+                "Через прокси",
+                "<small>Домены и IP-адреса, которые должны идти через прокси.\n"
+                "Одна запись на строку. Примеры:\n"
+                "  • <tt>example.com</tt>\n"
+                "  • <tt>192.168.1.0/24</tt></small>",
+                None,
+            ),
+            (
+                "_direct_list_text",
+                "Напрямую",
+                "<small>Домены и IP-адреса, которые должны идти напрямую (без прокси и VPN).\n"
+                "Одна запись на строку. Примеры:\n"
+                "  • <tt>local.example.com</tt>\n"
+                "  • <tt>10.0.0.0/8</tt></small>",
+                self._bypass_local_check,
+            ),
+            (
+                "_vpn_list_text",
+                "Через VPN",
+                "<small>Домены и IP-адреса, которые должны идти через VPN.\n"
+                "Доступно только если включена интеграция VPN.\n"
+                "Одна запись на строку. Примеры:\n"
+                "  • <tt>vpn.example.com</tt>\n"
+                "  • <tt>172.16.0.0/12</tt></small>",
+                None,
+            ),
+        )
 
-        box.pack_start(Gtk.Box(), True, True, 0)
+        for attr, tab_label, hint_markup, extra in list_pages:
+            list_scroll = Gtk.ScrolledWindow()
+            list_scroll.set_shadow_type(Gtk.ShadowType.IN)
+            list_scroll.set_min_content_height(200)
+            text_view = Gtk.TextView()
+            text_view.set_wrap_mode(Gtk.WrapMode.WORD)
+            text_view.modify_font(self._MONO_FONT)
+            list_scroll.add(text_view)
+            text_view.get_buffer().connect("changed", self._on_list_buffer_changed)
+            setattr(self, attr, text_view)
+
+            hint = Gtk.Label()
+            hint.set_markup(hint_markup)
+            hint.set_halign(Gtk.Align.START)
+            hint.get_style_context().add_class("dim-label")
+
+            page_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
+            set_margins(page_box, 5)
+            page_box.pack_start(hint, False, False, 0)
+            if extra is not None:
+                page_box.pack_start(extra, False, False, 0)
+            page_box.pack_start(list_scroll, True, True, 0)
+            lists_notebook.append_page(page_box, Gtk.Label(label=tab_label))
 
         scrolled.add(box)
         return scrolled
 
-    def _on_routing_mode_changed(self, radio: Gtk.RadioButton | None) -> None:
+    def _on_routing_mode_changed(
+        self, radio: Gtk.RadioButton | None, mode: str | None = None
+    ) -> None:
         """Routing mode change handler."""
-        if not hasattr(self, "_routing_radios") or not hasattr(self, "_proxy_list_text"):
+        if radio is not None:
+            # "toggled" is also emitted by the radio being deactivated
+            if not radio.get_active():
+                return
+            self._active_routing_mode = mode
+
+        if self._routing_radios is None or self._proxy_list_text is None:
             return
 
-        is_custom = False
-        for mode, r in self._routing_radios.items():
-            if r.get_active() and mode == RoutingMode.CUSTOM:
-                is_custom = True
-                break
+        is_custom = self._active_routing_mode == RoutingMode.CUSTOM
 
         self._proxy_list_text.set_sensitive(is_custom)
         self._direct_list_text.set_sensitive(is_custom)
         self._vpn_list_text.set_sensitive(True)
-        if hasattr(self, "_bypass_local_check"):
+        if self._bypass_local_check is not None:
             self._bypass_local_check.set_sensitive(is_custom)
 
+    def _on_list_buffer_changed(self, buffer: Gtk.TextBuffer) -> None:
+        """Drop the parsed lines of an edited routing list."""
+        self._lines_cache.pop(buffer, None)
+
+    def _buffer_to_lines(self, text_view: Gtk.TextView) -> list[str]:
+        """Get non-empty stripped lines of text view contents."""
+        buffer = text_view.get_buffer()
+        lines = self._lines_cache.get(buffer)
+        if lines is None:
+            start, end = buffer.get_bounds()
+            text = buffer.get_text(start, end, False)
+            lines = [line for line in (raw.strip() for raw in text.splitlines()) if line]
+            self._lines_cache[buffer] = lines
+        return list(lines)
+
+    @staticmethod
+    def _set_lines(text_view: Gtk.TextView, lines: list[str]) -> None:
+        """Replace text view contents with lines as a single buffer change."""
+        buffer = text_view.get_buffer()
+        # A shown view would re-layout on both the delete and the insert;
+        # detach the buffer meanwhile so it lays out once when reattached
+        detach = text_view.get_realized()
+        if detach:
+            text_view.set_buffer(Gtk.TextBuffer())
+        buffer.begin_user_action()
+        buffer.set_text("\n".join(lines))
+        buffer.end_user_action()
+        if detach:
+            text_view.set_buffer(buffer)
+
     def _on_bypass_local_changed(self, check: Gtk.CheckButton) -> None:
         """Bypass local networks checkbox handler."""
-        if not hasattr(self, "_direct_list_text"):
+        if self._direct_list_text is None:
             return
-        
-        local_networks = [
-            "127.0.0.0/8",
-            "10.0.0.0/8",
-            "172.16.0.0/12",
-            "192.168.0.0/16",
-            "169.254.0.0/16",
-            "::1/128",
-            "fc00::/7",
-            "fe80::/10",
-        ]
-        
-        buffer = self._direct_list_text.get_buffer()
-        start, end = buffer.get_bounds()
-        current_text = buffer.get_text(start, end, True)
-        current_lines = [line.strip() for line in current_text.split("\n") if line.strip()]
-        
+        self._flush_pending_lists()
+
+        current_lines = self._buffer_to_lines(self._direct_list_text)
+
         if check.get_active():
-            for network in local_networks:
-                if network not in current_lines:
-                    current_lines.append(network)
+            present = set(current_lines)
+            current_lines.extend(n for n in LOCAL_NETWORK_CIDRS if n not in present)
         else:
-            current_lines = [line for line in current_lines if line not in local_networks]
-        
-        buffer.set_text("\n".join(current_lines))
+            current_lines = [line for line in current_lines if line not in _LOCAL_NETWORKS_SET]
+
+        self._set_lines(self._direct_list_text, current_lines)
+
+    def _fill_pending_lists(self) -> bool:
+        """Fill deferred direct and VPN lists (runs in GTK main loop)."""
+        self._pending_lists_source = None
+        pending, self._pending_lists = self._pending_lists, None
+        if pending is None or self._destroyed:
+            return False
+        direct_list, vpn_list = pending
+        self._set_lines(self._direct_list_text, direct_list)
+        self._set_lines(self._vpn_list_text, vpn_list)
+        return False
+
+    def _flush_pending_lists(self) -> None:
+        """Fill deferred lists now if the idle callback has not run yet."""
+        if self._pending_lists_source is not None:
+            GLib.source_remove(self._pending_lists_source)
+            self._fill_pending_lists()
 
     def _on_vpn_enable_changed(self, check: Gtk.CheckButton) -> None:
         """VPN enable checkbox handler."""
@@ -513,23 +555,105 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
 
     def _on_vpn_refresh_clicked(self, button: Gtk.Button | None) -> None:
         """Refresh VPN status."""
+        # Clicks while a probe is running are served by its result
+        if self._refresh_pending:
+            return
+        if button is not None:
+            # An explicit refresh re-lists connections and interfaces too
+            invalidate_list_cache()
+            thread = threading.Thread(target=self._query_system_lists, daemon=True)
+            thread.start()
+        self._refresh_pending = True
+        self._vpn_status_label.set_markup(self._STATUS_CHECKING)
         connection_name = self._vpn_connection_entry.get_text().strip() or "aiso"
-        is_active = is_vpn_active(connection_name)
+        thread = threading.Thread(
+            target=self._query_vpn_status, args=(connection_name,), daemon=True
+        )
+        thread.start()
 
-        if is_active:
-            interface = get_vpn_interface(connection_name)
-            if interface:
-                self._vpn_status_label.set_markup(
-                    f"<span color='green'>●</span> <b>Подключено</b> (интерфейс: {interface})"
-                )
-            else:
-                self._vpn_status_label.set_markup(
-                    "<span color='green'>●</span> <b>Подключено</b> (интерфейс не определён)"
-                )
+    def _query_vpn_status(self, connection_name: str) -> None:
+        """Query VPN connection state (runs in worker thread)."""
+        interface = None
+        try:
+            is_active = is_vpn_active(connection_name)
+            if is_active:
+                interface = get_vpn_interface(connection_name)
+        except Exception:
+            is_active = False
+        GLib.idle_add(self._apply_vpn_status, is_active, interface)
+
+    def _apply_vpn_status(self, is_active: bool, interface: str | None) -> bool:
+        """Show VPN connection state (runs in GTK main loop)."""
+        self._refresh_pending = False
+        if self._destroyed:
+            return False
+
+        if not is_active:
+            markup = self._STATUS_DISCONNECTED
+        elif interface:
+            markup = self._STATUS_CONNECTED.format(GLib.markup_escape_text(interface))
         else:
-            self._vpn_status_label.set_markup("<span color='red'>●</span> <b>Не подключено</b>")
+            markup = self._STATUS_CONNECTED_NO_IFACE
+        self._vpn_status_label.set_markup(markup)
+        return False
+
+    def _on_destroy(self, widget: Gtk.Widget) -> None:
+        """Mark dialog as destroyed for pending background results."""
+        self._destroyed = True
+        if self._error_dialog is not None:
+            self._error_dialog.destroy()
+            self._error_dialog = None
+
+    def _query_system_lists(self) -> None:
+        """Query VPN connections and network interfaces (runs in worker thread)."""
+        try:
+            vpn_names = cached_vpn_connections()
+        except Exception:
+            vpn_names = []
+        try:
+            interfaces = cached_network_interfaces()
+        except Exception:
+            interfaces = []
+        GLib.idle_add(self._apply_system_lists, vpn_names, interfaces)
+
+    def _apply_system_lists(self, vpn_names: list[str], interfaces: list[str]) -> bool:
+        """Fill VPN name completion and interface combos (runs in GTK main loop)."""
+        if self._destroyed:
+            return False
+
+        self._available_vpn_connections = vpn_names
+        if vpn_names:
+            completion = Gtk.EntryCompletion()
+            completion.set_model(_vpn_completion_store(vpn_names))
+            completion.set_text_column(0)
+            completion.set_inline_completion(True)
+            completion.set_inline_selection(True)
+            self._vpn_connection_entry.set_completion(completion)
+
+        # Both combos offer the same interfaces; a saved interface may already be listed
+        for iface in interfaces:
+            if iface not in self._vpn_iface_index:
+                self._vpn_iface_index[iface] = len(self._vpn_iface_index)
+                self._vpn_interface_combo.append_text(iface)
+            if iface not in self._direct_iface_index:
+                self._direct_iface_index[iface] = len(self._direct_iface_index)
+                self._direct_interface_combo.append_text(iface)
 
-    def _load_settings(self) -> None:
+        return False
+
+    @staticmethod
+    def _select_interface(combo: Gtk.ComboBoxText, index: dict[str, int], name: str) -> None:
+        """Select interface in combo, appending it if it is not listed."""
+        if not name:
+            combo.set_active(0)
+            return
+        row = index.get(name)
+        if row is None:
+            row = index[name] = len(index)
+            combo.append_text(name)
+        combo.set_active(row)
+
+    def _load_vpn_settings(self) -> None:
         """Load VPN settings from profile."""
         vpn = self._profile.vpn_settings
 
@@ -539,55 +663,55 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
 
         self._vpn_enable_check.set_active(vpn.enabled)
         self._vpn_connection_entry.set_text(vpn.connection_name)
+        if vpn.enabled:
+            self._accepted_connection_name = vpn.connection_name
 
-        vpn_interface = vpn.interface_name
-        if vpn_interface:
-            model = self._vpn_interface_combo.get_model()
-            for i, row in enumerate(model):
-                if row[0] == vpn_interface:
-                    self._vpn_interface_combo.set_active(i)
-                    break
-            else:
-                self._vpn_interface_combo.append_text(vpn_interface)
-                self._vpn_interface_combo.set_active(len(model))
-        else:
-            self._vpn_interface_combo.set_active(0)
-
-        direct_interface = getattr(vpn, "direct_interface", "") or ""
-        if direct_interface:
-            model = self._direct_interface_combo.get_model()
-            for i, row in enumerate(model):
-                if row[0] == direct_interface:
-                    self._direct_interface_combo.set_active(i)
-                    break
-            else:
-                self._direct_interface_combo.append_text(direct_interface)
-                self._direct_interface_combo.set_active(len(model))
-        else:
-            self._direct_interface_combo.set_active(0)
+        self._select_interface(
+            self._vpn_interface_combo, self._vpn_iface_index, vpn.interface_name
+        )
+        self._select_interface(
+            self._direct_interface_combo, self._direct_iface_index, vpn.direct_interface
+        )
 
-        self._vpn_auto_connect_check.set_active(getattr(vpn, "auto_connect", False))
+        self._vpn_auto_connect_check.set_active(vpn.auto_connect)
 
-        # Load routing settings
+        self._on_vpn_enable_changed(self._vpn_enable_check)
+        # Status of a disabled integration is probed only on "Обновить"
+        if vpn.enabled:
+            self._on_vpn_refresh_clicked(None)
+        else:
+            self._vpn_status_label.set_markup(self._STATUS_UNKNOWN)
+
+    def _load_routing_settings(self) -> None:
+        """Load routing settings from profile."""
         routing = self._profile.routing_settings
         if routing is None:
             routing = RoutingSettings()
 
-        if hasattr(self, "_routing_radios") and routing.mode in self._routing_radios:
+        if self._routing_radios is not None and routing.mode in self._routing_radios:
+            # Handler runs once below, after the lists are loaded
+            for mode, radio in self._routing_radios.items():
+                radio.handler_block(self._routing_radio_handlers[mode])
             self._routing_radios[routing.mode].set_active(True)
+            for mode, radio in self._routing_radios.items():
+                radio.handler_unblock(self._routing_radio_handlers[mode])
+            self._active_routing_mode = routing.mode
+
+        if self._proxy_list_text is not None:
+            self._set_lines(self._proxy_list_text, routing.proxy_list)
 
-        if hasattr(self, "_proxy_list_text") and hasattr(self, "_direct_list_text") and hasattr(self, "_vpn_list_text"):
-            self._proxy_list_text.get_buffer().set_text("\n".join(routing.proxy_list))
-            self._direct_list_text.get_buffer().set_text("\n".join(routing.direct_list))
-            self._vpn_list_text.get_buffer().set_text("\n".join(routing.vpn_list))
+            # Direct and VPN tabs start hidden; fill them once the dialog has painted
+            self._pending_lists = (routing.direct_list, routing.vpn_list)
+            self._pending_lists_source = GLib.idle_add(self._fill_pending_lists)
 
-            if hasattr(self, "_bypass_local_check"):
+            # A toggle here flushes the pending fill, so its handler edits the loaded list
+            if self._bypass_local_check is not None:
                 self._bypass_local_check.set_active(routing.bypass_local_networks)
 
-            if hasattr(self, "_routing_radios"):
+            if self._routing_radios is not None:
                 self._on_routing_mode_changed(None)
 
-        if hasattr(self, "_routing_order_combo") and hasattr(self, "_routing_order_presets"):
+        if self._routing_order_combo is not None:
             try:
                 current_order = routing.get_rule_order()
             except AttributeError:
@@ -602,19 +726,30 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
 
             self._routing_order_combo.set_active(active_index)
 
-        self._on_vpn_enable_changed(self._vpn_enable_check)
-        self._on_vpn_refresh_clicked(None)
-
     def save_settings(self) -> bool:
         """Save VPN settings to profile.
 
         Returns:
             True if settings were saved successfully
         """
+        self._ensure_ui()
         profile_name = self._profile_name_entry.get_text().strip()
         if profile_name:
             self._profile.bean.name = profile_name
 
+        # Pages never opened keep the profile's settings as they are
+        if self._vpn_enable_check is not None and not self._save_vpn_settings():
+            return False
+        if self._routing_radios is not None:
+            self._save_routing_settings()
+        return True
+
+    def _save_vpn_settings(self) -> bool:
+        """Save VPN page to profile.
+
+        Returns:
+            False if the VPN connection name was rejected
+        """
         # Create or update VPN settings
         if self._profile.vpn_settings is None:
             self._profile.vpn_settings = VpnSettings()
@@ -646,63 +781,64 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
 
         vpn.auto_connect = self._vpn_auto_connect_check.get_active()
 
-        # Validate VPN connection name if integration is enabled
-        if vpn.enabled:
-            try:
-                available = list_vpn_connections()
-            except Exception:
-                available = []
+        # Validate VPN connection name if integration is enabled and the name is new
+        if vpn.enabled and vpn.connection_name != self._accepted_connection_name:
+            available = self._available_vpn_connections
+            # Query once more before rejecting, the connection may have been added meanwhile
+            if vpn.connection_name not in available:
+                invalidate_list_cache("vpn_connections")
+                try:
+                    available = cached_vpn_connections()
+                except Exception:
+                    available = []
 
             if available and vpn.connection_name not in available:
-                dialog = Gtk.MessageDialog(
-                    transient_for=self,
-                    flags=0,
-                    message_type=Gtk.MessageType.ERROR,
-                    buttons=Gtk.ButtonsType.OK,
-                    text="VPN подключение не найдено",
-                )
-                dialog.set_wmclass("tenga-proxy", "tenga-proxy")
-                dialog.set_type_hint(Gdk.WindowTypeHint.DIALOG)
-                dialog.set_skip_taskbar_hint(True)
-                dialog.format_secondary_text(
-                    f'Подключение с именем "{vpn.connection_name}" '
-                    "не найдено в NetworkManager.\n\n"
-                    "Проверьте имя или создайте VPN-подключение в настройках сети."
-                )
-                dialog.run()
-                dialog.destroy()
+                self._show_connection_not_found(vpn.connection_name)
                 return False
+        return True
+
+    def _show_connection_not_found(self, connection_name: str) -> None:
+        """Report unknown VPN connection name, reusing the error dialog."""
+        if self._error_dialog is None:
+            dialog = Gtk.MessageDialog(
+                transient_for=self,
+                flags=0,
+                message_type=Gtk.MessageType.ERROR,
+                buttons=Gtk.ButtonsType.OK,
+                text="VPN подключение не найдено",
+            )
+            dialog.set_wmclass("tenga-proxy", "tenga-proxy")
+            dialog.set_type_hint(Gdk.WindowTypeHint.DIALOG)
+            dialog.set_skip_taskbar_hint(True)
+            self._error_dialog = dialog
+        self._error_dialog.format_secondary_text(
+            f'Подключение с именем "{connection_name}" '
+            "не найдено в NetworkManager.\n\n"
+            "Проверьте имя или создайте VPN-подключение в настройках сети."
+        )
+        self._error_dialog.run()
+        self._error_dialog.hide()
+
+    def _save_routing_settings(self) -> None:
+        """Save routing page to profile."""
         if self._profile.routing_settings is None:
             self._profile.routing_settings = RoutingSettings()
 
         routing = self._profile.routing_settings
+        self._flush_pending_lists()
 
-        if hasattr(self, "_routing_radios"):
-            for mode, radio in self._routing_radios.items():
-                if radio.get_active():
-                    routing.mode = mode
-                    break
-
-        if hasattr(self, "_proxy_list_text") and hasattr(self, "_direct_list_text") and hasattr(self, "_vpn_list_text"):
-            proxy_buffer = self._proxy_list_text.get_buffer()
-            start, end = proxy_buffer.get_bounds()
-            proxy_text = proxy_buffer.get_text(start, end, True)
-            routing.proxy_list = [line.strip() for line in proxy_text.split("\n") if line.strip()]
+        if self._routing_radios is not None:
+            routing.mode = self._active_routing_mode
 
-            direct_buffer = self._direct_list_text.get_buffer()
-            start, end = direct_buffer.get_bounds()
-            direct_text = direct_buffer.get_text(start, end, True)
-            routing.direct_list = [line.strip() for line in direct_text.split("\n") if line.strip()]
+        if self._proxy_list_text is not None:
+            routing.proxy_list = self._buffer_to_lines(self._proxy_list_text)
+            routing.direct_list = self._buffer_to_lines(self._direct_list_text)
+            routing.vpn_list = self._buffer_to_lines(self._vpn_list_text)
 
-            vpn_buffer = self._vpn_list_text.get_buffer()
-            start, end = vpn_buffer.get_bounds()
-            vpn_text = vpn_buffer.get_text(start, end, True)
-            routing.vpn_list = [line.strip() for line in vpn_text.split("\n") if line.strip()]
-
-            if hasattr(self, "_bypass_local_check"):
+            if self._bypass_local_check is not None:
                 routing.bypass_local_networks = self._bypass_local_check.get_active()
 
-        if hasattr(self, "_routing_order_combo") and hasattr(self, "_routing_order_presets"):
+        if self._routing_order_combo is not None:
             active_index = self._routing_order_combo.get_active()
             if (
                 active_index is not None
@@ -714,8 +850,6 @@ class ProfileVpnSettingsDialog(Gtk.Dialog):
                 if preset:
                     routing.rule_order = list(preset)
 
-        return True
-
 
 def show_profile_vpn_settings_dialog(
     profile: ProfileEntry,
@@ -9,18 +9,42 @@ from src.db.config import RoutingMode
 
 gi.require_version("Gtk", "3.0")
 
-from gi.repository import Gdk, Gtk
+from gi.repository import Gdk, GLib, GObject, Gtk
 
 from src import __app_author__, __app_description__, __app_website__
 from src import __app_name__ as APP_NAME
 from src import __version__ as APP_VERSION
 from src.db.config import DnsProvider
+from src.ui.dialogs._widgets import set_margins
 
 if TYPE_CHECKING:
     from src.core.context import AppContext
 
 logger = logging.getLogger("tenga.ui.settings")
 
+# xray-core log levels in combo order
+_LOG_LEVELS = ("trace", "debug", "info", "warn", "error", "fatal", "panic")
+_LOG_LEVEL_INDEX = {level: index for index, level in enumerate(_LOG_LEVELS)}
+
+# Constant label markup
+_DNS_URL_MARKUP = {
+    provider: f"<small><tt>{url}</tt></small>"
+    for provider, url in DnsProvider.URLS.items()
+    if url and url != "local"
+}
+_DNS_EXAMPLES_MARKUP = (
+    "<small>Примеры:\n"
+    "  • <tt>8.8.8.8</tt> — обычный UDP DNS\n"
+    "  • <tt>https://dns.google/dns-query</tt> — DoH\n"
+    "  • <tt>tls://dns.google</tt> — DoT</small>"
+)
+_ABOUT_NAME_MARKUP = f"<span size='xx-large' weight='bold'>{APP_NAME}</span>"
+_ABOUT_VERSION_MARKUP = f"<span size='large'>Версия {APP_VERSION}</span>"
+_ABOUT_WEBSITE_MARKUP = f"<a href='{__app_website__}'>{__app_website__}</a>"
+
+# About page never changes, so dialogs reuse one and detach it when destroyed
+_about_page: Gtk.Widget | None = None
+
 
 class SettingsDialog(Gtk.Dialog):
     """Application settings dialog."""
@@ -50,8 +74,14 @@ class SettingsDialog(Gtk.Dialog):
         self._context = context
         self._core_dir = context.config_dir
 
+        # Pages other than "Основные" are built on first switch to their tab
+        self._lazy_pages: dict[Gtk.Widget, Callable[[], Gtk.Widget]] = {}
+        self._monitoring_enable_check: Gtk.CheckButton | None = None
+        self._dns_radios: dict[str, Gtk.RadioButton] | None = None
+        self._general_load_source: int | None = None
+
         self._setup_ui()
-        self._load_settings()
+        self.connect("destroy", self._on_destroy)
 
     def _on_realize(self, widget: Gtk.Widget) -> None:
         """Handle window realization - set WM_CLASS via Gdk.Window."""
@@ -68,31 +98,94 @@ class SettingsDialog(Gtk.Dialog):
         content = self.get_content_area()
         content.set_spacing(0)
 
-        # Notebook with tabs
-        notebook = Gtk.Notebook()
-        content.pack_start(notebook, True, True, 0)
+        # Stack with switcher; unlike a notebook it sizes only the visible page
+        stack = Gtk.Stack()
+        stack.set_transition_type(Gtk.StackTransitionType.NONE)
+        stack.set_homogeneous(False)
+        switcher = Gtk.StackSwitcher()
+        switcher.set_stack(stack)
+        switcher.set_halign(Gtk.Align.CENTER)
+        switcher.set_margin_top(10)
+        content.pack_start(switcher, False, False, 0)
+        content.pack_start(stack, True, True, 0)
         # Tab: General
         general_page = self._create_general_page()
-        notebook.append_page(general_page, Gtk.Label(label="Основные"))
-        # Tab: Monitoring
-        monitoring_page = self._create_monitoring_page()
-        notebook.append_page(monitoring_page, Gtk.Label(label="Мониторинг"))
-        # Tab: DNS
-        dns_page = self._create_dns_page()
-        notebook.append_page(dns_page, Gtk.Label(label="DNS"))
-        # Tab: About
-        about_page = self._create_about_page()
-        notebook.append_page(about_page, Gtk.Label(label="О программе"))
-
+        stack.add_titled(general_page, "general", "Основные")
+        # Fields are filled after the first paint, below resize/redraw priority
+        self._general_load_source = GLib.idle_add(
+            self._on_general_load_idle, priority=GLib.PRIORITY_DEFAULT_IDLE
+        )
+        # Tabs: Monitoring, DNS, About fill their empty holders when first shown
+        for build, name, title in (
+            (self._build_monitoring_page, "monitoring", "Мониторинг"),
+            (self._build_dns_page, "dns", "DNS"),
+            (self._get_about_page, "about", "О программе"),
+        ):
+            holder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            self._lazy_pages[holder] = build
+            stack.add_titled(holder, name, title)
+
+        stack.connect("notify::visible-child", self._on_page_switched)
         content.show_all()
 
+    def _on_page_switched(self, stack: Gtk.Stack, pspec: GObject.ParamSpec) -> None:
+        """Build a lazy page the first time it is selected."""
+        page = stack.get_visible_child()
+        build = self._lazy_pages.pop(page, None)
+        if build is None:
+            return
+        built = build()
+        page.pack_start(built, True, True, 0)
+        built.show_all()
+
+    def _get_about_page(self) -> Gtk.Widget:
+        """Get shared about page, or a new one while another dialog shows it."""
+        global _about_page
+        if _about_page is None:
+            _about_page = self._create_about_page()
+        elif _about_page.get_parent() is not None:
+            # A widget has one parent; the shared page stays with the other dialog
+            return self._create_about_page()
+        return _about_page
+
+    def _on_general_load_idle(self) -> bool:
+        """Load general settings (runs in GTK main loop)."""
+        self._general_load_source = None
+        self._load_general_settings()
+        return False
+
+    def _flush_general_load(self) -> None:
+        """Load general settings now if the idle callback has not run yet."""
+        if self._general_load_source is not None:
+            GLib.source_remove(self._general_load_source)
+            self._on_general_load_idle()
+
+    def _on_destroy(self, widget: Gtk.Widget) -> None:
+        """Drop pending load and detach shared about page so it outlives this dialog."""
+        if self._general_load_source is not None:
+            GLib.source_remove(self._general_load_source)
+            self._general_load_source = None
+        if _about_page is not None:
+            holder = _about_page.get_parent()
+            if holder is not None and holder.get_toplevel() is self:
+                holder.remove(_about_page)
+
+    def _build_monitoring_page(self) -> Gtk.Widget:
+        """Create and load monitoring settings page."""
+        page = self._create_monitoring_page()
+        self._load_monitoring_settings()
+        return page
+
+    def _build_dns_page(self) -> Gtk.Widget:
+        """Create and load DNS settings page."""
+        page = self._create_dns_page()
+        self._load_dns_settings()
+        return page
+
     def _create_general_page(self) -> Gtk.Widget:
         """Create general settings page."""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         # Proxy settings
         proxy_frame = Gtk.Frame()
@@ -102,10 +195,7 @@ class SettingsDialog(Gtk.Dialog):
         proxy_grid = Gtk.Grid()
         proxy_grid.set_row_spacing(8)
         proxy_grid.set_column_spacing(10)
-        proxy_grid.set_margin_start(10)
-        proxy_grid.set_margin_end(10)
-        proxy_grid.set_margin_top(10)
-        proxy_grid.set_margin_bottom(10)
+        set_margins(proxy_grid, 10)
         proxy_frame.add(proxy_grid)
 
         proxy_grid.attach(Gtk.Label(label="Адрес:", halign=Gtk.Align.END), 0, 0, 1, 1)
@@ -125,15 +215,12 @@ class SettingsDialog(Gtk.Dialog):
         log_grid = Gtk.Grid()
         log_grid.set_row_spacing(8)
         log_grid.set_column_spacing(10)
-        log_grid.set_margin_start(10)
-        log_grid.set_margin_end(10)
-        log_grid.set_margin_top(10)
-        log_grid.set_margin_bottom(10)
+        set_margins(log_grid, 10)
         log_frame.add(log_grid)
 
         log_grid.attach(Gtk.Label(label="Уровень:", halign=Gtk.Align.END), 0, 0, 1, 1)
         self._log_combo = Gtk.ComboBoxText()
-        for level in ["trace", "debug", "info", "warn", "error", "fatal", "panic"]:
+        for level in _LOG_LEVELS:
             self._log_combo.append_text(level)
         log_grid.attach(self._log_combo, 1, 0, 1, 1)
 
@@ -145,10 +232,7 @@ class SettingsDialog(Gtk.Dialog):
     def _create_monitoring_page(self) -> Gtk.Widget:
         """Create monitoring settings page."""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         # Monitoring settings
         monitoring_frame = Gtk.Frame()
@@ -158,10 +242,7 @@ class SettingsDialog(Gtk.Dialog):
         monitoring_grid = Gtk.Grid()
         monitoring_grid.set_row_spacing(8)
         monitoring_grid.set_column_spacing(10)
-        monitoring_grid.set_margin_start(10)
-        monitoring_grid.set_margin_end(10)
-        monitoring_grid.set_margin_top(10)
-        monitoring_grid.set_margin_bottom(10)
+        set_margins(monitoring_grid, 10)
         monitoring_frame.add(monitoring_grid)
 
         self._monitoring_enable_check = Gtk.CheckButton(label="Включить мониторинг соединений")
@@ -187,10 +268,7 @@ class SettingsDialog(Gtk.Dialog):
     def _create_dns_page(self) -> Gtk.Widget:
         """Create DNS settings page."""
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=15)
-        box.set_margin_start(15)
-        box.set_margin_end(15)
-        box.set_margin_top(15)
-        box.set_margin_bottom(15)
+        set_margins(box, 15)
 
         # DNS provider
         provider_frame = Gtk.Frame()
@@ -198,35 +276,33 @@ class SettingsDialog(Gtk.Dialog):
         box.pack_start(provider_frame, False, False, 0)
 
         provider_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        provider_box.set_margin_start(10)
-        provider_box.set_margin_end(10)
-        provider_box.set_margin_top(10)
-        provider_box.set_margin_bottom(10)
+        set_margins(provider_box, 10)
         provider_frame.add(provider_box)
 
         self._dns_radios = {}
+        # The first radio of a group starts active
+        self._selected_dns_provider = DnsProvider.ALL[0]
         first_radio = None
+        labels = DnsProvider.LABELS
+        new_radio = Gtk.RadioButton.new_with_label_from_widget
 
         for provider in DnsProvider.ALL:
+            # A None group member starts a new group
+            radio = new_radio(first_radio, labels[provider])
             if first_radio is None:
-                radio = Gtk.RadioButton.new_with_label(None, DnsProvider.LABELS[provider])
                 first_radio = radio
-            else:
-                radio = Gtk.RadioButton.new_with_label_from_widget(
-                    first_radio, DnsProvider.LABELS[provider]
-                )
 
-            radio.connect("toggled", self._on_dns_provider_changed)
+            radio.connect("toggled", self._on_dns_provider_changed, provider)
             self._dns_radios[provider] = radio
 
             row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
             row.pack_start(radio, False, False, 0)
 
             # Show URL for DoH providers
-            url = DnsProvider.URLS.get(provider, "")
-            if url and url != "local":
+            url_markup = _DNS_URL_MARKUP.get(provider)
+            if url_markup:
                 url_label = Gtk.Label()
-                url_label.set_markup(f"<small><tt>{url}</tt></small>")
+                url_label.set_markup(url_markup)
                 url_label.get_style_context().add_class("dim-label")
                 row.pack_start(url_label, False, False, 0)
 
@@ -238,10 +314,7 @@ class SettingsDialog(Gtk.Dialog):
         box.pack_start(custom_frame, False, False, 0)
 
         custom_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
-        custom_box.set_margin_start(10)
-        custom_box.set_margin_end(10)
-        custom_box.set_margin_top(10)
-        custom_box.set_margin_bottom(10)
+        set_margins(custom_box, 10)
         custom_frame.add(custom_box)
 
         custom_hint = Gtk.Label()
@@ -257,12 +330,7 @@ class SettingsDialog(Gtk.Dialog):
         custom_box.pack_start(self._dns_custom_entry, False, False, 0)
 
         examples_label = Gtk.Label()
-        examples_label.set_markup(
-            "<small>Примеры:\n"
-            "  • <tt>8.8.8.8</tt> — обычный UDP DNS\n"
-            "  • <tt>https://dns.google/dns-query</tt> — DoH\n"
-            "  • <tt>tls://dns.google</tt> — DoT</small>"
-        )
+        examples_label.set_markup(_DNS_EXAMPLES_MARKUP)
         examples_label.set_halign(Gtk.Align.START)
         examples_label.get_style_context().add_class("dim-label")
         custom_box.pack_start(examples_label, False, False, 0)
@@ -273,10 +341,7 @@ class SettingsDialog(Gtk.Dialog):
         box.pack_start(options_frame, False, False, 0)
 
         options_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
-        options_box.set_margin_start(10)
-        options_box.set_margin_end(10)
-        options_box.set_margin_top(10)
-        options_box.set_margin_bottom(10)
+        set_margins(options_box, 10)
         options_frame.add(options_box)
 
         self._dns_use_proxy_check = Gtk.CheckButton(label="DNS запросы через прокси")
@@ -296,18 +361,15 @@ class SettingsDialog(Gtk.Dialog):
         scrolled.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=20)
-        box.set_margin_start(20)
-        box.set_margin_end(20)
-        box.set_margin_top(20)
-        box.set_margin_bottom(20)
+        set_margins(box, 20)
 
         name_label = Gtk.Label()
-        name_label.set_markup(f"<span size='xx-large' weight='bold'>{APP_NAME}</span>")
+        name_label.set_markup(_ABOUT_NAME_MARKUP)
         name_label.set_halign(Gtk.Align.CENTER)
         box.pack_start(name_label, False, False, 0)
 
         version_label = Gtk.Label()
-        version_label.set_markup(f"<span size='large'>Версия {APP_VERSION}</span>")
+        version_label.set_markup(_ABOUT_VERSION_MARKUP)
         version_label.set_halign(Gtk.Align.CENTER)
         box.pack_start(version_label, False, False, 0)
 
@@ -330,10 +392,7 @@ class SettingsDialog(Gtk.Dialog):
         info_grid = Gtk.Grid()
         info_grid.set_row_spacing(8)
         info_grid.set_column_spacing(15)
-        info_grid.set_margin_start(15)
-        info_grid.set_margin_end(15)
-        info_grid.set_margin_top(15)
-        info_grid.set_margin_bottom(15)
+        set_margins(info_grid, 15)
         info_frame.add(info_grid)
 
         info_grid.attach(Gtk.Label(label="Автор:", halign=Gtk.Align.START), 0, 0, 1, 1)
@@ -343,7 +402,7 @@ class SettingsDialog(Gtk.Dialog):
 
         info_grid.attach(Gtk.Label(label="GitHub:", halign=Gtk.Align.START), 0, 1, 1, 1)
         website_label = Gtk.Label()
-        website_label.set_markup(f"<a href='{__app_website__}'>{__app_website__}</a>")
+        website_label.set_markup(_ABOUT_WEBSITE_MARKUP)
         website_label.set_halign(Gtk.Align.START)
         website_label.set_use_markup(True)
         info_grid.attach(website_label, 1, 1, 1, 1)
@@ -358,32 +417,30 @@ class SettingsDialog(Gtk.Dialog):
         scrolled.add(box)
         return scrolled
 
-    def _on_dns_provider_changed(self, radio: Gtk.RadioButton) -> None:
+    def _on_dns_provider_changed(self, radio: Gtk.RadioButton, provider: str) -> None:
         """DNS provider change handler."""
-        # Do nothing for now
+        if radio.get_active():
+            self._selected_dns_provider = provider
 
-    def _load_settings(self) -> None:
-        """Load current settings."""
+    def _load_general_settings(self) -> None:
+        """Load general settings."""
         config = self._context.config
-        dns = config.dns
 
-        # General settings
         self._address_entry.set_text(config.inbound_address)
         self._port_spin.set_value(config.inbound_socks_port)
 
         # Log level
-        log_levels = ["trace", "debug", "info", "warn", "error", "fatal", "panic"]
-        if config.log_level in log_levels:
-            self._log_combo.set_active(log_levels.index(config.log_level))
-        else:
-            self._log_combo.set_active(2)  # info
+        self._log_combo.set_active(_LOG_LEVEL_INDEX.get(config.log_level, _LOG_LEVEL_INDEX["info"]))
 
-        # Monitoring settings
-        monitoring = config.monitoring
+    def _load_monitoring_settings(self) -> None:
+        """Load monitoring settings."""
+        monitoring = self._context.config.monitoring
         self._monitoring_enable_check.set_active(monitoring.enabled)
         self._monitoring_interval_spin.set_value(monitoring.check_interval_seconds)
 
-        # DNS settings
+    def _load_dns_settings(self) -> None:
+        """Load DNS settings."""
+        dns = self._context.config.dns
         if dns.provider in self._dns_radios:
             self._dns_radios[dns.provider].set_active(True)
         self._dns_custom_entry.set_text(dns.custom_url)
@@ -395,6 +452,7 @@ class SettingsDialog(Gtk.Dialog):
         Returns:
             True if settings were saved successfully
         """
+        self._flush_general_load()
         config = self._context.config
         dns = config.dns
 
@@ -402,21 +460,19 @@ class SettingsDialog(Gtk.Dialog):
         config.inbound_address = self._address_entry.get_text().strip()
         config.inbound_socks_port = int(self._port_spin.get_value())
 
-        log_levels = ["trace", "debug", "info", "warn", "error", "fatal", "panic"]
-        config.log_level = log_levels[self._log_combo.get_active()]
+        config.log_level = _LOG_LEVELS[self._log_combo.get_active()]
 
-        # Monitoring settings
-        monitoring = config.monitoring
-        monitoring.enabled = self._monitoring_enable_check.get_active()
-        monitoring.check_interval_seconds = int(self._monitoring_interval_spin.get_value())
-
-        # DNS settings
-        for provider, radio in self._dns_radios.items():
-            if radio.get_active():
-                dns.provider = provider
-                break
-        dns.custom_url = self._dns_custom_entry.get_text().strip()
-        dns.use_proxy = self._dns_use_proxy_check.get_active()
+        # Monitoring settings, kept as they are if the tab was never opened
+        if self._monitoring_enable_check is not None:
+            monitoring = config.monitoring
+            monitoring.enabled = self._monitoring_enable_check.get_active()
+            monitoring.check_interval_seconds = int(self._monitoring_interval_spin.get_value())
+
+        # DNS settings, kept as they are if the tab was never opened
+        if self._dns_radios is not None:
+            dns.provider = self._selected_dns_provider
+            dns.custom_url = self._dns_custom_entry.get_text().strip()
+            dns.use_proxy = self._dns_use_proxy_check.get_active()
 
         # Save
         self._context.save_config()
@@ -427,45 +483,45 @@ def show_settings_dialog(
     context: AppContext,
     parent: Gtk.Window | None = None,
     on_config_reload: Callable[[], None] | None = None,
-) -> bool:
+) -> SettingsDialog:
     """
     Show settings dialog.
 
+    Returns at once; the response is handled from the main loop instead of
+    a nested one.
+
     Args:
         context: Application context
         parent: Parent window
         on_config_reload: Optional callback to reload configuration after saving
 
     Returns:
-        True if settings were applied
+        Shown dialog
     """
     dialog = SettingsDialog(context, parent)
-    applied = False
-    while True:
-        response = dialog.run()
-        if response == Gtk.ResponseType.APPLY:
-            if dialog.save_settings():
-                applied = True
-                # If proxy is running and reload callback is provided, reload config
-                if context.proxy_state.is_running and on_config_reload:
-                    try:
-                        on_config_reload()
-                    except Exception as e:
-                        logger.exception("Error reloading configuration: %s", e)
-                break
-            continue
-        break
-
-    dialog.destroy()
-
-    if applied and parent:
+    dialog.connect("response", _on_settings_response, context, parent, on_config_reload)
+    dialog.show()
+    return dialog
 
-        def update_ui():
-            if hasattr(parent, "_update_monitoring_tab_visibility"):
-                parent._update_monitoring_tab_visibility()
 
-        from gi.repository import GLib
-
-        GLib.idle_add(update_ui)
+def _on_settings_response(
+    dialog: SettingsDialog,
+    response: int,
+    context: AppContext,
+    parent: Gtk.Window | None,
+    on_config_reload: Callable[[], None] | None,
+) -> None:
+    """Apply or dismiss settings dialog."""
+    if response == Gtk.ResponseType.APPLY:
+        if not dialog.save_settings():
+            return
+        # If proxy is running and reload callback is provided, reload config
+        if context.proxy_state.is_running and on_config_reload:
+            try:
+                on_config_reload()
+            except Exception as e:
+                logger.exception("Error reloading configuration: %s", e)
+        if parent and hasattr(parent, "_update_monitoring_tab_visibility"):
+            GLib.idle_add(parent._update_monitoring_tab_visibility)
 
-    return applied
+    dialog.destroy()
@@ -160,9 +160,12 @@ class SubscriptionDialog(Gtk.Dialog):
             )
 
     def _on_paste_clicked(self, button: Gtk.Button) -> None:
-        """Paste from clipboard."""
+        """Paste from clipboard (without blocking on the clipboard owner)."""
         clipboard = Gtk.Clipboard.get(Gdk.SELECTION_CLIPBOARD)
-        text = clipboard.wait_for_text()
+        clipboard.request_text(self._on_clipboard_text)
+
+    def _on_clipboard_text(self, clipboard: Gtk.Clipboard, text: str | None) -> None:
+        """Clipboard text received."""
         if text:
             self._url_entry.set_text(text.strip())
 
@@ -14,12 +14,6 @@ gi.require_version("Gtk", "3.0")
 
 from gi.repository import Gdk, GdkPixbuf, GLib, Gtk, Pango
 
-from src.ui.dialogs import (
-    show_edit_group_dialog,
-    show_edit_profile_dialog,
-    show_profile_vpn_settings_dialog,
-    show_subscription_dialog,
-)
 from src.sub.updater import SubscriptionUpdater
 
 if TYPE_CHECKING:
@@ -55,6 +49,8 @@ class MainWindow(Gtk.Window):
         self._subscription_list: Gtk.TreeView | None = None
         self._subscription_store: Gtk.ListStore | None = None
         self._connect_button: Gtk.Button | None = None
+        # A connect is in flight, the connect button cancels it
+        self._connecting = False
         self._status_label: Gtk.Label | None = None
         self._header_icon: Gtk.Image | None = None
         # Delay label
@@ -821,6 +817,8 @@ class MainWindow(Gtk.Window):
 
     def _on_add_subscription_clicked(self, button: Gtk.Button) -> None:
         """Click on Add Subscription button."""
+        from src.ui.dialogs import show_subscription_dialog
+
         result = show_subscription_dialog(self)
 
         if result:
@@ -965,6 +963,8 @@ class MainWindow(Gtk.Window):
         if not group:
             return
 
+        from src.ui.dialogs import show_subscription_dialog
+
         result = show_subscription_dialog(self, group)
 
         if result:
@@ -1107,6 +1107,18 @@ class MainWindow(Gtk.Window):
         except Exception:
             pass
 
+    def set_connect_progress(self, text: str | None) -> None:
+        """Show connection progress in status label (None restores current state).
+
+        The connect button cancels the connection while it is in flight.
+        """
+        self._connecting = text is not None
+        if text is None:
+            self._update_ui(self._context.proxy_state)
+            return
+        self._status_label.set_text(text)
+        self._connect_button.set_label("✕ Отменить")
+
     def _update_ui(self, state: ProxyState) -> None:
         """Update UI."""
         if state.is_running:
@@ -1120,7 +1132,9 @@ class MainWindow(Gtk.Window):
             if self._header_icon:
                 self._update_icon_color("#4CAF50")
 
-            self._connect_button.set_label("⏻ Отключить")
+            self._connect_button.set_label(
+                "✕ Отменить" if self._connecting else "⏻ Отключить"
+            )
         else:
             self._status_label.set_text("Отключено")
             self._status_label.get_style_context().remove_class("status-connected")
@@ -1129,7 +1143,9 @@ class MainWindow(Gtk.Window):
             if self._header_icon:
                 self._update_icon_color("#9E9E9E")
 
-            self._connect_button.set_label("⏻ Подключить")
+            self._connect_button.set_label(
+                "✕ Отменить" if self._connecting else "⏻ Подключить"
+            )
             if self._delay_label:
                 self._delay_label.set_text("—")
                 ctx = self._delay_label.get_style_context()
@@ -1215,6 +1231,8 @@ class MainWindow(Gtk.Window):
                             except Exception:
                                 pass
 
+                    from src.ui.dialogs import show_profile_vpn_settings_dialog
+
                     show_profile_vpn_settings_dialog(
                         profile, self, on_settings_applied=on_settings_applied
                     )
@@ -1225,8 +1243,8 @@ class MainWindow(Gtk.Window):
         return False
 
     def _on_connect_clicked(self, button: Gtk.Button) -> None:
-        """Click on Connect/Disconnect button."""
-        if self._context.proxy_state.is_running:
+        """Click on Connect/Disconnect/Cancel button."""
+        if self._connecting or self._context.proxy_state.is_running:
             if self._on_disconnect:
                 self._on_disconnect()
         else:
@@ -1367,6 +1385,8 @@ class MainWindow(Gtk.Window):
             if not profile:
                 return
 
+            from src.ui.dialogs import show_edit_profile_dialog
+
             changed = show_edit_profile_dialog(profile, self)
             if changed:
                 self._context.profiles.save()
@@ -1379,6 +1399,8 @@ class MainWindow(Gtk.Window):
             if not group:
                 return
             if group.is_subscription:
+                from src.ui.dialogs import show_subscription_dialog
+
                 result = show_subscription_dialog(self, group)
                 if result:
                     name, url = result
@@ -1388,6 +1410,8 @@ class MainWindow(Gtk.Window):
                     self._refresh_profiles()
                     self._refresh_subscriptions()
             else:
+                from src.ui.dialogs import show_edit_group_dialog
+
                 new_name = show_edit_group_dialog(self, group)
                 if new_name:
                     group.name = new_name
@@ -39,6 +39,16 @@ def test_proxy_state_remove_listener():
     assert calls == [True]
 
 
+def test_proxy_state_set_stopped_resets_config_hash():
+    state = ProxyState()
+    state.set_running(1)
+    state.last_config_hash = b"digest"
+
+    state.set_stopped()
+
+    assert state.last_config_hash == b""
+
+
 def test_app_context_uses_custom_config_dir(tmp_path):
     config_dir = tmp_path / "config"
     ctx = AppContext(config_dir=config_dir)
@@ -0,0 +1,61 @@
+import json
+
+from src.core import xray_manager
+from src.core.xray_manager import dump_config
+
+
+def test_dump_config_roundtrip_preserves_unicode():
+    config = {"remarks": "Сервер", "outbounds": [{"tag": "proxy"}]}
+
+    data = dump_config(config)
+
+    assert isinstance(data, bytes)
+    assert json.loads(data) == config
+    assert "Сервер".encode() in data
+
+
+def test_dump_config_without_orjson(monkeypatch):
+    monkeypatch.setattr(xray_manager, "orjson", None)
+    config = {"log": {"loglevel": "warning"}}
+
+    data = dump_config(config)
+
+    assert data == json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def test_start_passes_config_on_stdin(tmp_path, monkeypatch):
+    received = tmp_path / "received.json"
+    binary = tmp_path / "xray"
+    binary.write_text(f'#!/bin/sh\ncat > "{received}"\nexec sleep 10\n')
+    binary.chmod(0o755)
+    monkeypatch.setattr(xray_manager, "XRAY_LOG_FILE", tmp_path / "xray.log")
+
+    manager = xray_manager.XrayManager(binary_path=binary)
+    config = {"log": {"loglevel": "warning"}, "inbounds": [], "outbounds": []}
+    try:
+        success, error = manager.start(config)
+        assert success, error
+    finally:
+        manager.stop()
+
+    sent = json.loads(received.read_bytes())
+    assert sent["log"] == config["log"]
+
+
+def test_start_writes_serialized_config_unchanged(tmp_path, monkeypatch):
+    received = tmp_path / "received.json"
+    binary = tmp_path / "xray"
+    binary.write_text(f'#!/bin/sh\ncat > "{received}"\nexec sleep 10\n')
+    binary.chmod(0o755)
+    monkeypatch.setattr(xray_manager, "XRAY_LOG_FILE", tmp_path / "xray.log")
+
+    manager = xray_manager.XrayManager(binary_path=binary)
+    serialized = manager.serialize_config({"inbounds": [], "outbounds": []})
+    assert json.loads(serialized)["api"]["tag"] == "api"
+    try:
+        success, error = manager.start(serialized)
+        assert success, error
+    finally:
+        manager.stop()
+
+    assert received.read_bytes() == serialized
@@ -0,0 +1,64 @@
+from src.db.config import LOCAL_NETWORK_CIDRS, RoutingSettings
+
+
+def test_parse_entries_splits_domains_and_ips():
+    settings = RoutingSettings()
+
+    domains, ips = settings.parse_entries(
+        ["example.com", "10.0.0.0/8", "192.168.1.1", "sub.example.org"]
+    )
+
+    assert domains == ["example.com", "sub.example.org"]
+    assert ips == ["10.0.0.0/8", "192.168.1.1/32"]
+
+
+def test_parse_entries_handles_comma_separated_values():
+    settings = RoutingSettings()
+
+    domains, ips = settings.parse_entries([" a.com, 1.2.3.4 ,", ",b.com,,", "   "])
+
+    assert domains == ["a.com", "b.com"]
+    assert ips == ["1.2.3.4/32"]
+
+
+def test_parse_entries_drops_duplicates_keeping_order():
+    settings = RoutingSettings()
+
+    domains, ips = settings.parse_entries(
+        ["b.com", "a.com", "b.com", "1.1.1.1", "1.1.1.1/32", "fc00::/7", "fc00::/7"]
+    )
+
+    assert domains == ["b.com", "a.com"]
+    assert ips == ["1.1.1.1/32", "fc00::/7"]
+
+
+def test_parse_entries_treats_non_cidr_slash_as_domain():
+    settings = RoutingSettings()
+
+    domains, ips = settings.parse_entries(["example.com/path", "1.2.3.4/abc"])
+
+    assert domains == ["example.com/path", "1.2.3.4/abc"]
+    assert ips == []
+
+
+def test_local_network_cidrs_are_classified_as_ips():
+    domains, ips = RoutingSettings().parse_entries(list(LOCAL_NETWORK_CIDRS))
+
+    assert domains == []
+    assert ips == list(LOCAL_NETWORK_CIDRS)
+
+
+def test_load_list_file_skips_comments_and_rereads_changes(tmp_path):
+    settings = RoutingSettings()
+    list_file = tmp_path / "proxy_list.txt"
+    list_file.write_text("# comment\nexample.com\n\n 10.0.0.0/8 \n", encoding="utf-8")
+
+    assert settings.load_list_file(list_file) == ["example.com", "10.0.0.0/8"]
+    assert settings.load_list_file(list_file) == ["example.com", "10.0.0.0/8"]
+
+    list_file.write_text("example.org\n", encoding="utf-8")
+    assert settings.load_list_file(list_file) == ["example.org"]
+
+
+def test_load_list_file_missing(tmp_path):
+    assert RoutingSettings().load_list_file(tmp_path / "missing.txt") == []
@@ -0,0 +1,80 @@
+from src.sys import vpn
+
+
+def test_cached_vpn_connections_reuses_listing_within_ttl(monkeypatch):
+    calls = []
+
+    def fake_list() -> list[str]:
+        calls.append(1)
+        return ["work", "home"]
+
+    monkeypatch.setattr(vpn, "list_vpn_connections", fake_list)
+    monkeypatch.setattr(vpn, "_list_cache", {})
+
+    first = vpn.cached_vpn_connections()
+    first.append("mutated")
+    assert vpn.cached_vpn_connections() == ["work", "home"]
+    assert len(calls) == 1
+
+
+def test_cached_vpn_connections_expire_after_ttl(monkeypatch):
+    calls = []
+    now = [100.0]
+
+    def fake_list() -> list[str]:
+        calls.append(1)
+        return ["work"]
+
+    monkeypatch.setattr(vpn, "list_vpn_connections", fake_list)
+    monkeypatch.setattr(vpn, "_list_cache", {})
+    monkeypatch.setattr(vpn.time, "monotonic", lambda: now[0])
+
+    vpn.cached_vpn_connections()
+    now[0] += vpn._LIST_CACHE_TTL
+    vpn.cached_vpn_connections()
+    assert len(calls) == 2
+
+
+def test_cached_network_interfaces_kept_until_invalidated(monkeypatch):
+    calls = []
+    now = [100.0]
+
+    def fake_list() -> list[str]:
+        calls.append(1)
+        return ["eth0"]
+
+    monkeypatch.setattr(vpn, "list_network_interfaces", fake_list)
+    monkeypatch.setattr(vpn, "_list_cache", {})
+    monkeypatch.setattr(vpn.time, "monotonic", lambda: now[0])
+
+    vpn.cached_network_interfaces()
+    now[0] += vpn._LIST_CACHE_TTL * 100
+    vpn.cached_network_interfaces()
+    assert len(calls) == 1
+
+    vpn.invalidate_list_cache()
+    vpn.cached_network_interfaces()
+    assert len(calls) == 2
+
+
+def test_invalidate_list_cache_single_key_keeps_other_listings(monkeypatch):
+    calls = {"vpn": 0, "ifaces": 0}
+
+    def fake_vpn() -> list[str]:
+        calls["vpn"] += 1
+        return ["work"]
+
+    def fake_ifaces() -> list[str]:
+        calls["ifaces"] += 1
+        return ["eth0"]
+
+    monkeypatch.setattr(vpn, "list_vpn_connections", fake_vpn)
+    monkeypatch.setattr(vpn, "list_network_interfaces", fake_ifaces)
+    monkeypatch.setattr(vpn, "_list_cache", {})
+
+    vpn.cached_vpn_connections()
+    vpn.cached_network_interfaces()
+    vpn.invalidate_list_cache("vpn_connections")
+    vpn.cached_vpn_connections()
+    vpn.cached_network_interfaces()
+    assert calls == {"vpn": 2, "ifaces": 1}
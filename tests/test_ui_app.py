@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import importlib
+import signal
+import sys
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.core.context import AppContext
+from src.core.xray_manager import dump_config
+
+
+@pytest.fixture
+def app_module():
+    with patch.dict(sys.modules, {"gi": MagicMock(), "gi.repository": MagicMock()}):
+        for name in [name for name in sys.modules if name.startswith("src.ui")]:
+            del sys.modules[name]
+        yield importlib.import_module("src.ui.app")
+
+
+@pytest.fixture
+def app(app_module, tmp_path):
+    previous = signal.getsignal(signal.SIGINT)
+    try:
+        yield app_module.TengaApp(AppContext(config_dir=tmp_path))
+    finally:
+        signal.signal(signal.SIGINT, previous)
+
+
+def test_sigint_handler_replaces_default_int_handler(app, app_module):
+    # PyGObject's Gtk.main only installs its KeyboardInterrupt fallback over the default
+    assert signal.getsignal(signal.SIGINT) is not signal.default_int_handler
+    assert signal.getsignal(signal.SIGINT) == app._on_sigint
+
+    app._on_sigint(signal.SIGINT, None)
+
+    idle_add = app_module.GLib.idle_add
+    idle_add.assert_called_once()
+    assert idle_add.call_args[0][:2] == (app._on_signal, signal.SIGINT)
+
+
+def test_sigterm_dispatched_by_glib(app, app_module):
+    app_module.GLib.unix_signal_add.assert_called_once()
+    args = app_module.GLib.unix_signal_add.call_args[0]
+    assert args[1:] == (signal.SIGTERM, app._on_signal, signal.SIGTERM)
+
+
+def _run_idle_callbacks(calls) -> None:
+    for call in calls:
+        callback, *args = call[0]
+        callback(*args)
+
+
+def test_stale_connect_callback_ignored_after_reconnect(app, app_module, monkeypatch):
+    profile = MagicMock(vpn_settings=None)
+    profile.name = "test"
+    xray_manager = MagicMock()
+    xray_manager.start.return_value = (True, "")
+    xray_manager.stop.return_value = (True, "")
+    xray_manager.serialize_config.side_effect = dump_config
+    app._context._xray_manager = xray_manager
+    monkeypatch.setattr(app._context.profiles, "get_profile", lambda profile_id: profile)
+    monkeypatch.setattr(app, "_create_config", lambda profile: {"outbounds": []})
+    monkeypatch.setattr(app_module, "set_system_proxy", lambda **kwargs: True)
+    monkeypatch.setattr(app_module, "clear_system_proxy", lambda: True)
+    idle_add = app_module.GLib.idle_add
+    proxy_state = app._context.proxy_state
+
+    # First attempt finishes in the worker, its callbacks are still queued
+    assert app._connect(1)
+    app._connect_thread.join()
+    stale = len(idle_add.call_args_list)
+    # Disconnect and connect again before the main loop runs them
+    app._disconnect()
+    assert app._connect(2)
+    app._connect_thread.join()
+
+    _run_idle_callbacks(idle_add.call_args_list[:stale])
+    assert not proxy_state.is_running
+
+    _run_idle_callbacks(idle_add.call_args_list[stale:])
+    assert proxy_state.is_running
+    assert proxy_state.started_profile_id == 2
+
+
+def test_quit_waits_for_cancelled_connect_without_blocking(app, app_module):
+    release = threading.Event()
+    worker = threading.Thread(target=release.wait, daemon=True)
+    worker.start()
+    app._connect_thread = worker
+    app._context._xray_manager = MagicMock(is_running=False)
+
+    app.quit()
+    main_quit = app_module.Gtk.main_quit
+    main_quit.assert_not_called()
+    poll = app_module.GLib.timeout_add.call_args[0][1]
+    assert poll() is True
+
+    release.set()
+    worker.join()
+    assert poll() is False
+    main_quit.assert_called_once()
+    # A second quit request while quitting is ignored
+    app.quit()
+    main_quit.assert_called_once()